@@ -0,0 +1,82 @@
+"""
+Benchmark: peak memory and time of splitting a few pages from a huge file.
+
+Builds one large scanned-style PDF (every page has its own image), then runs
+pdf_split for a handful of pages in a fresh process for each input mode:
+the default, which reads the whole file into memory, and mmap_inputs=True,
+which memory-maps it. Prints wall time and the child's peak RSS.
+
+Run from the repository root:
+    python benchmarks/bench_mmap.py --pages 400 --scan-size 600 --ranges 10-14
+"""
+
+from pathlib import Path
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = Path(__file__).resolve().parent.parent
+
+CHILD = """
+import json, sys, time
+from contextlib import redirect_stdout
+import io
+from pdf_edit import PDFEdit
+from pdf_metrics import peak_memory
+path, ranges, mmap_inputs, output_dir = sys.argv[1:]
+pdf_edit = PDFEdit(output_dir=output_dir, mmap_inputs=mmap_inputs == "1", reader_cache_bytes=0)
+start = time.perf_counter()
+with redirect_stdout(io.StringIO()):
+    pdf_edit.pdf_split([path], ranges=ranges)
+print(json.dumps({"seconds": time.perf_counter() - start, "peak": peak_memory()}))
+"""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=400)
+    parser.add_argument("--scan-size", type=int, default=600)
+    parser.add_argument("--ranges", default="10-14")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "archive.pdf")
+        # Built in its own process: Linux carries a process's peak RSS over
+        # to the children it starts, which would hide the children's own peak
+        subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys; from benchmarks.corpus import make_pdf; "
+                "make_pdf(sys.argv[1], pages=int(sys.argv[2]), scan_size=int(sys.argv[3]))",
+                source,
+                str(args.pages),
+                str(args.scan_size),
+            ],
+            cwd=ROOT,
+            check=True,
+        )
+        print(f"source: {os.path.getsize(source) / 2**20:.0f} MB, {args.pages} pages")
+        print(f"{'mode':<8} {'seconds':>9} {'peak RSS MB':>12}")
+        for mode, flag in (("read", "0"), ("mmap", "1")):
+            results = []
+            for _ in range(args.runs):
+                child = subprocess.run(
+                    [sys.executable, "-c", CHILD, source, args.ranges, flag, tmp],
+                    cwd=ROOT,
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                )
+                results.append(json.loads(child.stdout.splitlines()[-1]))
+            seconds = min(result["seconds"] for result in results)
+            peak = min(result["peak"] or 0 for result in results)
+            print(f"{mode:<8} {seconds:>9.3f} {peak / 2**20:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark: wall-clock time of pdf_marge against the number of workers.
+
+A synthetic corpus is merged serially and then with 2, 4, ... workers,
+where contiguous groups are merged in parallel and the parts joined in a
+final pass. The table shows seconds and speed-up over the serial merge.
+
+Run from the repository root:
+    python benchmarks/bench_parallel_marge.py --files 2000 --pages 5 --workers 1 2 4 8
+"""
+
+from contextlib import redirect_stdout
+from pathlib import Path
+import argparse
+import io
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.corpus import make_corpus
+from pdf_edit import PDFEdit
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=500)
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--outline-depth", type=int, default=2)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = make_corpus(
+            Path(tmp) / "corpus",
+            files=args.files,
+            pages=args.pages,
+            outline_depth=args.outline_depth,
+        )
+        print(f"{args.files} files x {args.pages} pages")
+        print(f"{'workers':>8} {'seconds':>9} {'speed-up':>9}")
+        baseline = None
+        for workers in args.workers:
+            # A fresh instance per run, so no reader cache carries over
+            pdf_edit = PDFEdit(output_dir=Path(tmp) / f"out-{workers}", reader_cache_bytes=0)
+            start = time.perf_counter()
+            with redirect_stdout(io.StringIO()):
+                pdf_edit.pdf_marge(files, workers=workers)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"{workers:>8} {elapsed:>9.2f} {baseline / elapsed:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
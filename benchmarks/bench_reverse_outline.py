@@ -0,0 +1,51 @@
+"""
+Benchmark: pdf_reverse on documents with deep, nested outlines.
+
+Every page gets a bookmark, nested in chains of --depth levels, and the
+time per page is printed for growing page counts. With the outline
+resolved once per document the time per page should stay flat, i.e.
+reverse time grows linearly with the page count.
+
+Run from the repository root:
+    python benchmarks/bench_reverse_outline.py --pages 250 500 1000 2000 --depth 8
+"""
+
+from pathlib import Path
+import argparse
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.corpus import make_pdf
+from pdf_edit import PDFEdit
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, nargs="+", default=[250, 500, 1000, 2000])
+    parser.add_argument("--depth", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Without the reader cache, so every repeat parses the source again
+        pdf_edit = PDFEdit(output_dir=Path(tmp) / "output", reader_cache_bytes=0)
+        per_page = []
+        print(f"{'pages':>8} {'seconds':>10} {'ms/page':>10}")
+        for pages in args.pages:
+            source = Path(tmp) / f"outline-{pages}.pdf"
+            make_pdf(source, pages=pages, outline_depth=args.depth)
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                pdf_edit.pdf_reverse([str(source)], workers=1)
+                best = min(best, time.perf_counter() - start)
+            per_page.append(best / pages)
+            print(f"{pages:>8} {best:>10.3f} {best / pages * 1000:>10.3f}")
+        print(f"ms/page ratio largest/smallest: {per_page[-1] / per_page[0]:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Benchmark: saving many outputs with the same name into one folder.
+
+Every save goes through PDFEdit.__save_file_as_pdf, which has to find a
+free 'copy-<n>' name. The time per save is printed for each block of
+saves; with the in-memory name index it should stay flat instead of
+growing with the number of files already in the folder.
+
+Run from the repository root:
+    python benchmarks/bench_save_naming.py --count 50000
+"""
+
+from pathlib import Path
+import argparse
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pypdf import PdfWriter
+
+from pdf_edit import PDFEdit
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=50000)
+    parser.add_argument("--blocks", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_edit = PDFEdit(output_dir=tmp)
+        save = pdf_edit._PDFEdit__save_file_as_pdf
+        block = max(1, args.count // args.blocks)
+        total = 0.0
+        print(f"{'saved':>8} {'ms/save':>10}")
+        for done in range(0, args.count, block):
+            start = time.perf_counter()
+            for _ in range(min(block, args.count - done)):
+                writer = PdfWriter()
+                writer.add_blank_page(width=200, height=200)
+                save(process="split", name="output.pdf", writer=writer)
+            elapsed = time.perf_counter() - start
+            total += elapsed
+            print(f"{done + block:>8} {elapsed / block * 1000:>10.3f}")
+        print(f"total: {total:.1f}s for {args.count} saves")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark: start-up time of short command-line invocations.
+
+Runs 'python project.py --help' and 'python -c "import pdf_edit"' many times
+and prints the median wall time of each, then the slowest imports reported
+by 'python -X importtime' for the --help run. The CLI should not load
+pypdf or the GUI toolkit until it has a job to do.
+
+Run from the repository root:
+    python benchmarks/bench_startup.py --runs 20
+"""
+
+from pathlib import Path
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = Path(__file__).resolve().parent.parent
+
+COMMANDS = {
+    "project.py --help": [sys.executable, "project.py", "--help"],
+    "import pdf_edit": [sys.executable, "-c", "import pdf_edit"],
+    "python (baseline)": [sys.executable, "-c", "pass"],
+}
+
+
+def import_times(command: list[str]) -> list[tuple[int, str]]:
+    """Return (cumulative microseconds, module) for every import of command."""
+    result = subprocess.run(
+        [command[0], "-X", "importtime", *command[1:]],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    times = []
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, module = line.split("|")
+            if cumulative.strip().isdigit():
+                times.append((int(cumulative), module.strip()))
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'command':<20} {'median ms':>10}")
+    for name, command in COMMANDS.items():
+        runs = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            subprocess.run(command, cwd=ROOT, stdout=subprocess.DEVNULL)
+            runs.append(time.perf_counter() - start)
+        print(f"{name:<20} {statistics.median(runs) * 1000:>10.1f}")
+
+    print("\nslowest imports of 'project.py --help' (cumulative ms):")
+    for cumulative, module in sorted(import_times(COMMANDS["project.py --help"]))[
+        -args.top :
+    ]:
+        print(f"{cumulative / 1000:>8.1f}  {module}")
+
+
+if __name__ == "__main__":
+    main()
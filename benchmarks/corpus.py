@@ -0,0 +1,173 @@
+"""
+Synthetic PDF corpus generator for the benchmarks.
+
+make_pdf writes one document with a configurable number of pages, a nested
+outline, embedded images and embedded fonts; make_corpus writes a folder of
+them. Images and fonts are derived from their index only, so every file of a
+corpus shares them, like documents produced from the same template.
+With scan_size every page also gets its own full-page image, like a scan.
+"""
+
+from pathlib import Path
+import os
+import random
+
+from pypdf import PdfWriter
+from pypdf.generic import (
+    ArrayObject,
+    DecodedStreamObject,
+    DictionaryObject,
+    NameObject,
+    NumberObject,
+)
+
+
+def _stream(data: bytes, entries: dict) -> DecodedStreamObject:
+    stream = DecodedStreamObject()
+    stream.set_data(data)
+    stream.update({NameObject(key): value for key, value in entries.items()})
+    return stream
+
+
+def _image(writer: PdfWriter, index, size: int = 64):
+    """Add a size x size RGB image XObject filled with noise seeded by index."""
+    data = random.Random(f"image-{index}").randbytes(size * size * 3)
+    return writer._add_object(
+        _stream(
+            data,
+            {
+                "/Type": NameObject("/XObject"),
+                "/Subtype": NameObject("/Image"),
+                "/Width": NumberObject(size),
+                "/Height": NumberObject(size),
+                "/ColorSpace": NameObject("/DeviceRGB"),
+                "/BitsPerComponent": NumberObject(8),
+            },
+        )
+    )
+
+
+def _font(writer: PdfWriter, index: int, size: int = 20000):
+    """Add a TrueType font dictionary embedding a font program seeded by index."""
+    program = writer._add_object(
+        _stream(
+            random.Random(f"font-{index}").randbytes(size),
+            {"/Length1": NumberObject(size)},
+        )
+    )
+    descriptor = writer._add_object(
+        DictionaryObject(
+            {
+                NameObject("/Type"): NameObject("/FontDescriptor"),
+                NameObject("/FontName"): NameObject(f"/Synthetic{index}"),
+                NameObject("/Flags"): NumberObject(32),
+                NameObject("/FontFile2"): program,
+            }
+        )
+    )
+    return writer._add_object(
+        DictionaryObject(
+            {
+                NameObject("/Type"): NameObject("/Font"),
+                NameObject("/Subtype"): NameObject("/TrueType"),
+                NameObject("/BaseFont"): NameObject(f"/Synthetic{index}"),
+                NameObject("/Encoding"): NameObject("/WinAnsiEncoding"),
+                NameObject("/FontDescriptor"): descriptor,
+            }
+        )
+    )
+
+
+def make_pdf(
+    path: str | Path,
+    pages: int = 10,
+    outline_depth: int = 0,
+    images: int = 0,
+    fonts: int = 0,
+    scan_size: int = 0,
+) -> None:
+    """
+    Write a synthetic PDF.
+    Every page carries a line of text, draws all 'images' and uses all 'fonts'
+    (Helvetica when fonts is 0). With outline_depth > 0 every page gets a
+    bookmark, nested in chains 'outline_depth' levels deep. With scan_size > 0
+    every page draws its own scan_size x scan_size image (3 bytes per pixel).
+    """
+    writer = PdfWriter()
+    image_refs = [_image(writer, index) for index in range(images)]
+    font_refs = [_font(writer, index) for index in range(fonts)]
+    if not font_refs:
+        font_refs = [
+            writer._add_object(
+                DictionaryObject(
+                    {
+                        NameObject("/Type"): NameObject("/Font"),
+                        NameObject("/Subtype"): NameObject("/Type1"),
+                        NameObject("/BaseFont"): NameObject("/Helvetica"),
+                    }
+                )
+            )
+        ]
+    resources = writer._add_object(
+        DictionaryObject(
+            {
+                NameObject("/Font"): DictionaryObject(
+                    {NameObject(f"/F{i}"): ref for i, ref in enumerate(font_refs)}
+                ),
+                NameObject("/XObject"): DictionaryObject(
+                    {NameObject(f"/Im{i}"): ref for i, ref in enumerate(image_refs)}
+                ),
+                NameObject("/ProcSet"): ArrayObject(
+                    [NameObject("/PDF"), NameObject("/Text"), NameObject("/ImageC")]
+                ),
+            }
+        )
+    )
+    for page_number in range(pages):
+        page = writer.add_blank_page(width=612, height=792)
+        content = []
+        for i in range(len(font_refs)):
+            content.append(
+                f"BT /F{i} 12 Tf 72 {720 - 20 * i} Td "
+                f"(Page {page_number + 1} account {100000 + page_number}) Tj ET"
+            )
+        for i in range(len(image_refs)):
+            content.append(f"q 64 0 0 64 {72 + 70 * i} 72 cm /Im{i} Do Q")
+        page[NameObject("/Resources")] = resources
+        if scan_size:
+            scan = _image(writer, f"scan-{page_number}", scan_size)
+            page_resources = DictionaryObject(resources.get_object())
+            page_resources[NameObject("/XObject")] = DictionaryObject(
+                {**page_resources["/XObject"], NameObject("/Scan"): scan}
+            )
+            page[NameObject("/Resources")] = page_resources
+            content.insert(0, "q 612 0 0 792 0 0 cm /Scan Do Q")
+        page[NameObject("/Contents")] = writer._add_object(
+            _stream("\n".join(content).encode(), {})
+        )
+    if outline_depth > 0:
+        parent = None
+        for page_number in range(pages):
+            if page_number % outline_depth == 0:
+                parent = None
+            parent = writer.add_outline_item(
+                f"Bookmark {page_number + 1}", page_number, parent=parent
+            )
+    with open(path, "wb") as f:
+        writer.write(f)
+
+
+def make_corpus(directory: str | Path, files: int = 10, **pdf_options) -> list[str]:
+    """
+    Write 'files' synthetic PDFs into directory (created if needed).
+    pdf_options are passed to make_pdf; the document is built once and its
+    bytes copied to the other files. Returns the file paths in order.
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = [os.path.join(directory, f"synthetic-{i:05d}.pdf") for i in range(files)]
+    if paths:
+        make_pdf(paths[0], **pdf_options)
+        data = Path(paths[0]).read_bytes()
+        for path in paths[1:]:
+            Path(path).write_bytes(data)
+    return paths
@@ -0,0 +1,163 @@
+"""
+Benchmark suite: time pdf_reverse, pdf_split and pdf_marge on synthetic corpora.
+
+Each case builds a corpus with benchmarks/corpus.py, runs every operation
+--repeat times and records the best and median wall-clock time. Results are
+written as JSON so that runs from different commits can be compared:
+
+    python benchmarks/run_benchmarks.py --output before.json
+    (change pdf_edit.py)
+    python benchmarks/run_benchmarks.py --output after.json
+    python benchmarks/run_benchmarks.py --compare before.json after.json
+
+Use --case name:files:pages:outline_depth:images:fonts to add custom cases.
+"""
+
+from contextlib import redirect_stdout
+from pathlib import Path
+import argparse
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pypdf
+
+from benchmarks.corpus import make_corpus
+from pdf_edit import PDFEdit
+
+CASES = {
+    "small": dict(files=10, pages=10, outline_depth=0, images=0, fonts=0),
+    "medium": dict(files=20, pages=100, outline_depth=4, images=2, fonts=1),
+    "large": dict(files=10, pages=1000, outline_depth=8, images=4, fonts=2),
+}
+
+
+def parse_case(text: str) -> tuple[str, dict]:
+    """Parse 'name:files:pages:outline_depth:images:fonts' into a case."""
+    name, *numbers = text.split(":")
+    keys = ["files", "pages", "outline_depth", "images", "fonts"]
+    if len(numbers) != len(keys) or not all(n.isdigit() for n in numbers):
+        raise argparse.ArgumentTypeError(f"Invalid case '{text}'")
+    return name, dict(zip(keys, map(int, numbers)))
+
+
+def time_operation(operation, repeat: int) -> dict:
+    """Run operation() 'repeat' times and return best and median seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        # Keep the per-file progress messages out of the timings and the report
+        with redirect_stdout(io.StringIO()):
+            operation()
+        timings.append(time.perf_counter() - start)
+    return {
+        "seconds_best": min(timings),
+        "seconds_median": statistics.median(timings),
+        "runs": repeat,
+    }
+
+
+def run_case(name: str, options: dict, repeat: int, workdir: Path) -> list[dict]:
+    """Build the corpus for one case and time every operation on it."""
+    files = make_corpus(workdir / name / "corpus", **options)
+    # Without the reader cache, so every run parses its inputs like the first one
+    pdf_edit = PDFEdit(output_dir=workdir / name / "output", reader_cache_bytes=0)
+    pages = options["pages"]
+    operations = {
+        "reverse": lambda: pdf_edit.pdf_reverse(files, workers=1),
+        "split": lambda: pdf_edit.pdf_split(files, from_=1, to=max(1, pages // 2)),
+        "split_chunks": lambda: pdf_edit.pdf_split(
+            files, chunk_size=max(1, pages // 10)
+        ),
+        "marge": lambda: pdf_edit.pdf_marge(files),
+    }
+    results = []
+    for operation_name, operation in operations.items():
+        if operation_name == "marge" and len(files) < 2:
+            continue
+        result = {"case": name, "operation": operation_name, **options}
+        result.update(time_operation(operation, repeat))
+        results.append(result)
+        print(
+            f"{name:>10} {operation_name:>14} "
+            f"{result['seconds_best']:>10.3f}s best {result['seconds_median']:>10.3f}s median"
+        )
+    return results
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(before_file: str, after_file: str) -> None:
+    """Print the median time ratio (after / before) for every shared result."""
+    before = json.loads(Path(before_file).read_text())
+    after = json.loads(Path(after_file).read_text())
+    old = {(r["case"], r["operation"]): r for r in before["results"]}
+    print(f"{before.get('commit')} -> {after.get('commit')}")
+    print(f"{'case':>10} {'operation':>14} {'before':>10} {'after':>10} {'ratio':>8}")
+    for result in after["results"]:
+        key = (result["case"], result["operation"])
+        if key not in old:
+            continue
+        was, now = old[key]["seconds_median"], result["seconds_median"]
+        print(
+            f"{key[0]:>10} {key[1]:>14} {was:>10.3f} {now:>10.3f} {now / was:>8.2f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--cases",
+        nargs="+",
+        default=["small", "medium"],
+        choices=sorted(CASES),
+        help="Built-in cases to run",
+    )
+    parser.add_argument(
+        "--case", type=parse_case, action="append", default=[], help="Custom case"
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"))
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    cases = [(name, CASES[name]) for name in args.cases] + args.case
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, options in cases:
+            results.extend(run_case(name, options, args.repeat, Path(tmp)))
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "pypdf": pypdf.__version__,
+        "platform": platform.platform(),
+        "results": results,
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2))
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
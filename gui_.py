@@ -1,6 +1,9 @@
+import os
+import queue
+import threading
 import customtkinter as ctk
 from tkinter import filedialog
-from pdf_edit import PDFEdit
+from pdf_edit import OperationCancelled, PDFEdit
 from CTkMessagebox import CTkMessagebox
 
 
@@ -58,6 +61,10 @@ class ToplevelWindow(ctk.CTkToplevel):
         super().__init__(parent, *args, **kwargs)
 
         self.pdf_edit = PDFEdit()
+        # The job runs on a worker thread; it talks to Tk only through this queue
+        self.pdf_edit.progress = self.__report_progress
+        self.events = queue.Queue()
+        self.worker = None
 
         self.name = name
         self.title(self.name)
@@ -68,7 +75,7 @@ class ToplevelWindow(ctk.CTkToplevel):
         self.lift()
         self.after(200, lambda: self.attributes("-topmost", False))
 
-        self.rowconfigure((0, 1, 2), weight=1)
+        self.rowconfigure((0, 1, 2, 3, 4), weight=1)
         self.columnconfigure((0, 1), weight=1)
 
         self.label_name_process = ctk.CTkLabel(
@@ -90,7 +97,7 @@ class ToplevelWindow(ctk.CTkToplevel):
         self.label_files = ctk.CTkLabel(self.scroll_frame, text="", font=("arial", 16))
 
         self.choose_files_btn = ctk.CTkButton(
-            self, text=f"{"Choose Files"}", command=self.choose_files_fun
+            self, text="Choose Files", command=self.choose_files_fun
         )
         self.choose_files_btn.grid(row=2, column=0)
 
@@ -99,6 +106,21 @@ class ToplevelWindow(ctk.CTkToplevel):
         )
         self.function_btn.grid(row=2, column=1, pady=10)
 
+        self.progress_bar = ctk.CTkProgressBar(self)
+        self.progress_bar.set(0)
+        self.progress_bar.grid(row=3, column=0, columnspan=2, padx=20, sticky="ew")
+
+        self.label_status = ctk.CTkLabel(self, text="", font=("arial", 14))
+        self.label_status.grid(row=4, column=0, padx=20)
+
+        self.cancel_btn = ctk.CTkButton(
+            self, text="Cancel", command=self.cancel_fun, state="disabled"
+        )
+        self.cancel_btn.grid(row=4, column=1, pady=10)
+
+        # Closing the window stops a running job instead of leaving it orphaned
+        self.protocol("WM_DELETE_WINDOW", self.close_fun)
+
         self.path_files = ()
         self.pdfs_names = ""
 
@@ -125,22 +147,17 @@ class ToplevelWindow(ctk.CTkToplevel):
     def btn_fun(self):
 
         if len(self.path_files) != 0:
+            if self.worker is not None and self.worker.is_alive():
+                # A job is already running; the cancel button stops it
+                return
+            files = [path for path in self.path_files]
             if self.name == "Reverse":
-                pdf_rev = self.pdf_edit.pdf_reverse([path for path in self.path_files])
-                if isinstance(pdf_rev, tuple):
-                    if ".pdf extension" in pdf_rev[1]:
-                        self.__error_message_box(message="Error in extension files")
-
-                self.label_files.grid_forget()
+                self.__start_job(lambda: self.pdf_edit.pdf_reverse(files))
 
             elif self.name == "Marge":
-                pdf_marge = self.pdf_edit.pdf_marge([path for path in self.path_files])
-                if isinstance(pdf_rev, tuple):
-                    if ".pdf extension" in pdf_marge[1]:
-                        self.__error_message_box(message="Error in extension files")
-                self.label_files.grid_forget()
-
                 # error handled in pdf_marge method
+                self.__start_job(lambda: self.pdf_edit.pdf_marge(files))
+
             elif self.name == "Split":
                 if (
                     not hasattr(self, "split_window")
@@ -154,22 +171,91 @@ class ToplevelWindow(ctk.CTkToplevel):
                     self.split_window.focus()
                     self.split_window.lift()
 
-                from_to = (
-                    int(self.split_window.from_to["from"]),
-                    int(self.split_window.from_to["to"]),
-                )
-                pdf_split = self.pdf_edit.pdf_split(
-                    [path for path in self.path_files], from_=from_to[0], to=from_to[1]
+                from_to = self.split_window.from_to
+                if not (
+                    from_to.get("from", "").isdigit() and from_to.get("to", "").isdigit()
+                ):
+                    # The window was closed without a valid range
+                    return
+                from_, to = int(from_to["from"]), int(from_to["to"])
+                self.__start_job(
+                    lambda: self.pdf_edit.pdf_split(files, from_=from_, to=to)
                 )
-
-                if isinstance(pdf_split, tuple):
-                    if ".pdf extension" in pdf_split[1]:
-                        self.__error_message_box(message="Error in extension files")
-                self.label_files.grid_forget()
         else:
             self.__error_message_box(message="You don't choose any files")
             self.label_files.grid_forget()
 
+    def cancel_fun(self):
+        if self.worker is not None and self.worker.is_alive():
+            self.pdf_edit.cancel_event.set()
+            self.label_status.configure(text="Cancelling...")
+
+    def close_fun(self):
+        self.pdf_edit.cancel_event.set()
+        self.destroy()
+
+    def __start_job(self, job):
+        self.pdf_edit.cancel_event.clear()
+        self.progress_bar.set(0)
+        self.label_status.configure(text=f"{self.name} started...")
+        self.function_btn.configure(state="disabled")
+        self.choose_files_btn.configure(state="disabled")
+        self.cancel_btn.configure(state="normal")
+        self.worker = threading.Thread(target=self.__run_job, args=(job,), daemon=True)
+        self.worker.start()
+        self.after(100, self.__poll_events)
+
+    def __run_job(self, job):
+        # Runs on the worker thread: never touch widgets from here
+        try:
+            self.events.put(("done", job()))
+        except OperationCancelled:
+            self.events.put(("cancelled", None))
+        except Exception as e:
+            self.events.put(("error", str(e)))
+
+    def __report_progress(self, file, done, total):
+        # Called on the worker thread for every copied page
+        self.events.put(("progress", (file, done, total)))
+
+    def __poll_events(self):
+        if not self.winfo_exists():
+            return
+        finished = None
+        while True:
+            try:
+                kind, value = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                file, done, total = value
+                self.progress_bar.set(done / total if total else 1)
+                self.label_status.configure(
+                    text=f"{os.path.basename(file)}: page {done} of {total}"
+                )
+            else:
+                finished = (kind, value)
+        if finished is None:
+            self.after(100, self.__poll_events)
+            return
+
+        kind, value = finished
+        self.function_btn.configure(state="normal")
+        self.choose_files_btn.configure(state="normal")
+        self.cancel_btn.configure(state="disabled")
+        if kind == "done":
+            self.progress_bar.set(1)
+            self.label_status.configure(text=f"{self.name} finished")
+            if isinstance(value, tuple) and ".pdf extension" in value[1]:
+                self.__error_message_box(message="Error in extension files")
+            self.label_files.grid_forget()
+        elif kind == "cancelled":
+            self.progress_bar.set(0)
+            self.label_status.configure(text=f"{self.name} cancelled")
+        else:
+            self.label_status.configure(text="")
+            self.__error_message_box(message=value)
+
     def __error_message_box(self, message):
         CTkMessagebox(
             title="Error", message=message.capitalize(), icon="cancel", sound=True
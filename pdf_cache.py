@@ -0,0 +1,278 @@
+from collections import OrderedDict
+from pathlib import Path
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+
+
+class ResultCache:
+    def __init__(
+        self,
+        cache_dir: str | Path,
+        max_bytes: int = 1 << 30,
+        max_age: float | None = None,
+    ):
+        """
+        Initialize an on-disk, content-addressed cache of operation outputs.
+        Entries are keyed by the content hash of the inputs plus the operation
+        and its parameters. Each entry keeps its own copy of its output
+        files, so a hit can hand back the previous output without reprocessing.
+        Least recently used entries are evicted once the cache holds more than
+        max_bytes, or when they have not been used for max_age seconds.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Load the index once: key -> entry dict (see put)
+        self.__entries = {}
+        for entry_file in self.cache_dir.glob("*.json"):
+            try:
+                self.__entries[entry_file.stem] = json.loads(entry_file.read_text())
+            except (OSError, ValueError):
+                continue
+
+    def key(self, operation: str, files: list[str], params=None) -> str:
+        """
+        Build the cache key for an operation over the given input files.
+        Inputs are hashed by content, so renamed or touched files still hit.
+        """
+        digest = hashlib.sha256()
+        digest.update(json.dumps([operation, params], default=str).encode())
+        for file in files:
+            with open(file, "rb") as source:
+                digest.update(hashlib.file_digest(source, "sha256").digest())
+        return digest.hexdigest()
+
+    def get(self, key: str):
+        """
+        Return the cached result (a path or a list of paths) for key, or None.
+        Output files that were deleted since are restored from the cache.
+        """
+        entry = self.__entries.get(key)
+        if entry is None:
+            # Another process sharing the cache folder may have stored it since
+            try:
+                entry = json.loads((self.cache_dir / f"{key}.json").read_text())
+                self.__entries[key] = entry
+            except (OSError, ValueError):
+                pass
+        if (
+            entry is None
+            or "hashes" not in entry
+            or not all(os.path.exists(self.cache_dir / blob) for blob in entry["blobs"])
+        ):
+            self.misses += 1
+            return None
+        outputs = []
+        for output, blob, digest in zip(entry["outputs"], entry["blobs"], entry["hashes"]):
+            blob_path = self.cache_dir / blob
+            if not os.path.exists(output):
+                shutil.copyfile(blob_path, output)
+            elif (
+                os.path.getsize(output) != os.path.getsize(blob_path)
+                or self.__hash_file(output) != digest
+            ):
+                # The old output was changed or replaced: serve the cached copy
+                output = str(blob_path)
+            outputs.append(output)
+        entry["used"] = time.time()
+        self.__write_entry(key, entry)
+        self.hits += 1
+        return outputs[0] if entry["single"] else outputs
+
+    def put(self, key: str, result) -> None:
+        """
+        Store the output path (or list of paths) produced for key, then evict
+        entries that are too old or push the cache over its size limit.
+        """
+        outputs = [result] if isinstance(result, str) else list(result)
+        blobs = []
+        hashes = []
+        size = 0
+        for index, output in enumerate(outputs):
+            blob = f"{key}-{index}.pdf"
+            blob_path = self.cache_dir / blob
+            # A copy, not a hard link: changing the output in place
+            # (e.g. pdf_append) must not change the cached result
+            shutil.copyfile(output, blob_path)
+            blobs.append(blob)
+            hashes.append(self.__hash_file(blob_path))
+            size += os.path.getsize(blob_path)
+        entry = {
+            "outputs": [str(output) for output in outputs],
+            "blobs": blobs,
+            "hashes": hashes,
+            "single": isinstance(result, str),
+            "size": size,
+            "used": time.time(),
+        }
+        self.__entries[key] = entry
+        self.__write_entry(key, entry)
+        self.evict()
+
+    def evict(self) -> None:
+        """Drop expired entries, then least recently used ones until under max_bytes."""
+        now = time.time()
+        by_age = sorted(self.__entries.items(), key=lambda item: item[1]["used"])
+        total = sum(entry["size"] for _, entry in by_age)
+        for key, entry in by_age:
+            expired = self.max_age is not None and now - entry["used"] > self.max_age
+            if not expired and total <= self.max_bytes:
+                break
+            self.__remove(key)
+            total -= entry["size"]
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and the current cache size."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self.__entries),
+            "bytes": sum(entry["size"] for entry in self.__entries.values()),
+        }
+
+    def __remove(self, key: str) -> None:
+        entry = self.__entries.pop(key)
+        for blob in entry["blobs"] + [f"{key}.json"]:
+            try:
+                os.remove(self.cache_dir / blob)
+            except FileNotFoundError:
+                pass
+
+    def __write_entry(self, key: str, entry: dict) -> None:
+        # Write to a temp file and rename so a crash never leaves half an entry
+        temp = self.cache_dir / f"{key}.json.tmp-{os.getpid()}"
+        temp.write_text(json.dumps(entry))
+        os.replace(temp, self.cache_dir / f"{key}.json")
+
+    @staticmethod
+    def __hash_file(path) -> str:
+        with open(path, "rb") as source:
+            return hashlib.file_digest(source, "sha256").hexdigest()
+
+
+class ReaderCache:
+    def __init__(self, max_bytes: int = 64 << 20):
+        """
+        Initialize a bounded, in-memory LRU cache of parsed PdfReader objects.
+        Entries are keyed by absolute path and validated against the file's
+        size and modification time, so a changed file is parsed again.
+        A reader's memory is estimated by the size of its file, and least
+        recently used readers are dropped once the total exceeds max_bytes.
+        """
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.bytes = 0
+        # path -> (size, mtime_ns, reader), least recently used first
+        self.__readers = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get(self, path: str):
+        """Return the cached reader for path if the file is unchanged, else None."""
+        path = os.path.abspath(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            stat = None
+        with self.__lock:
+            entry = self.__readers.get(path)
+            unchanged = stat and entry and entry[:2] == (stat.st_size, stat.st_mtime_ns)
+            if unchanged:
+                self.__readers.move_to_end(path)
+                self.hits += 1
+                return entry[2]
+            if entry is not None:
+                # The file changed (or vanished) since it was parsed
+                self.__drop(path)
+            self.misses += 1
+            return None
+
+    def put(self, path: str, reader, stat: os.stat_result | None = None) -> None:
+        """
+        Cache a reader parsed from path, evicting old readers if needed.
+        Pass the os.stat taken before the file was read, so that a file changed
+        while it was being parsed is never cached under its new size and mtime.
+        """
+        path = os.path.abspath(path)
+        stat = stat or os.stat(path)
+        if stat.st_size > self.max_bytes:
+            return
+        with self.__lock:
+            if path in self.__readers:
+                self.__drop(path)
+            self.__readers[path] = (stat.st_size, stat.st_mtime_ns, reader)
+            self.bytes += stat.st_size
+            while self.bytes > self.max_bytes:
+                self.__drop(next(iter(self.__readers)))
+
+    def clear(self) -> None:
+        """Drop every cached reader."""
+        with self.__lock:
+            self.__readers.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and the current size of the cache."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self.__readers),
+            "bytes": self.bytes,
+        }
+
+    def __drop(self, path: str) -> None:
+        size, _, _ = self.__readers.pop(path)
+        self.bytes -= size
+
+
+class PageIndex:
+    def __init__(self, index_file: str | Path):
+        """
+        Initialize a persistent index of page counts, keyed by absolute path.
+        Entries are validated against the file's size and modification time,
+        so a changed file is scanned again. Call save() to write new entries.
+        """
+        self.index_file = Path(index_file)
+        # path -> [size, mtime_ns, pages]
+        self.__entries = {}
+        self.__changed = False
+        self.__lock = threading.Lock()
+        try:
+            self.__entries = json.loads(self.index_file.read_text())
+        except (OSError, ValueError):
+            pass
+
+    def get(self, path: str, stat: os.stat_result) -> tuple | None:
+        """Return (pages,) for an unchanged file, else None. pages may be None."""
+        entry = self.__entries.get(os.path.abspath(path))
+        if entry and entry[:2] == [stat.st_size, stat.st_mtime_ns]:
+            return (entry[2],)
+        return None
+
+    def put(self, path: str, stat: os.stat_result, pages: int | None) -> None:
+        """Remember the page count of path as it was when stat was taken."""
+        with self.__lock:
+            self.__entries[os.path.abspath(path)] = [
+                stat.st_size,
+                stat.st_mtime_ns,
+                pages,
+            ]
+            self.__changed = True
+
+    def save(self) -> None:
+        """Write the index if anything changed since it was loaded or saved."""
+        with self.__lock:
+            if not self.__changed:
+                return
+            # Write to a temp file and rename so a crash never leaves half an index
+            temp = self.index_file.with_name(f"{self.index_file.name}.tmp-{os.getpid()}")
+            temp.write_text(json.dumps(self.__entries))
+            os.replace(temp, self.index_file)
+            self.__changed = False
@@ -1,18 +1,183 @@
+from __future__ import annotations
+
 from pathlib import Path
 import argparse
+import hashlib
+import io
+import json
+import mmap
 import os
+import pickle
 import sys
+import threading
+import time
+
+from pdf_cache import PageIndex, ReaderCache, ResultCache
+from pdf_metrics import Metrics, measured
+
+# pypdf, concurrent.futures and tempfile are imported where they are
+# first needed, so '--help', argument errors and plain imports of this module
+# don't pay for them (see _load_pypdf).
+_PYPDF_NAMES = (
+    "PdfReader",
+    "PdfWriter",
+    "ArrayObject",
+    "DictionaryObject",
+    "IndirectObject",
+    "NameObject",
+    "StreamObject",
+)
+
+OPTIMIZE_LEVELS = ("off", "fast", "max")
+
+# How far from the end _check_structure looks for %%EOF and startxref;
+# more than pypdf's own search window, so padded files are accepted
+STRUCTURE_TAIL = 16 * 1024
+
+
+def _check_optimize_level(level: str) -> None:
+    """Raise ValueError unless level is one of OPTIMIZE_LEVELS."""
+    if level not in OPTIMIZE_LEVELS:
+        raise ValueError(
+            f"Unknown optimize level '{level}' (choose from {', '.join(OPTIMIZE_LEVELS)})"
+        )
+
+
+def _load_pypdf() -> None:
+    """Import the pypdf names this module uses, once, into its globals."""
+    global PdfReader, PdfWriter
+    global ArrayObject, DictionaryObject
+    global IndirectObject, NameObject, StreamObject
+    if "StreamObject" in globals():
+        return
+    from pypdf import PdfReader, PdfWriter
+    from pypdf.generic import (
+        ArrayObject,
+        DictionaryObject,
+        IndirectObject,
+        NameObject,
+        StreamObject,
+    )
+
+
+def __getattr__(name: str):
+    # pdf_edit.PdfReader and friends still work from outside the module
+    if name in _PYPDF_NAMES:
+        _load_pypdf()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class OperationCancelled(Exception):
+    """Raised inside a PDFEdit operation once its cancel_event is set."""
+
+
+def _is_path(source) -> bool:
+    """True for a file path; False for "-" (stdin), bytes and file-like objects."""
+    return isinstance(source, (str, os.PathLike)) and source != "-"
+
+
+def _check_structure(path: str) -> str | None:
+    """
+    Check a PDF's header and trailer without parsing it.
+    Reads only the first kilobyte and the last STRUCTURE_TAIL bytes, and rejects
+    only files pypdf cannot open: no %PDF- header, or no %%EOF or startxref
+    near the end (a truncated download). A startxref offset that is a little
+    off is left for pypdf, which recovers from it.
+    Returns None for a sound file, else the reason it was rejected.
+    """
+    with open(path, "rb") as source:
+        head = source.read(1024)
+        if b"%PDF-" not in head:
+            return f"The file '{path}' is not a PDF (no %PDF- header)."
+        size = source.seek(0, os.SEEK_END)
+        source.seek(max(0, size - STRUCTURE_TAIL))
+        tail = source.read()
+        if b"%%EOF" not in tail:
+            return f"The file '{path}' is truncated (no %%EOF marker)."
+        if b"startxref" not in tail:
+            return f"The file '{path}' is damaged (no startxref)."
+    return None
 
-from pypdf import PdfReader, PdfWriter
+
+class _AppendedBytes:
+    """
+    A write-only stream that drops the first 'skip' bytes written to it and
+    appends the rest to file, while tell() keeps counting from the start.
+    pypdf writes an incremental update as the original file followed by the
+    new revision; this keeps only the new revision.
+    """
+
+    def __init__(self, file, skip: int):
+        self.file = file
+        self.skip = skip
+        self.position = 0
+
+    def write(self, data: bytes) -> int:
+        start = max(0, self.skip - self.position)
+        if start < len(data):
+            self.file.write(data[start:])
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self) -> None:
+        self.file.flush()
+
+
+def _count_pages(path: str) -> int | None:
+    """
+    Read a PDF's page count from the /Count of its page-tree root.
+    Only the cross-reference table and a few objects are read; the pages
+    themselves are not. Returns None when the file cannot be read.
+    """
+    _load_pypdf()
+    try:
+        with open(path, "rb") as source:
+            return int(PdfReader(source).trailer["/Root"]["/Pages"]["/Count"])
+    except Exception:
+        return None
 
 
 class PDFEdit:
-    def __init__(self, output_dir: str | None = None):
+    def __init__(
+        self,
+        output_dir: str | None = None,
+        cache: bool = False,
+        cache_max_bytes: int = 1 << 30,
+        cache_max_age: float | None = None,
+        metrics_hook=None,
+        progress=None,
+        reader_cache_bytes: int = 64 << 20,
+        image_max_size: int | None = None,
+        mmap_inputs: bool = False,
+    ):
         """
         Initialize a PDFEdit instance.
         If output_dir is provided, use it as the output directory for processed files.
         Otherwise, use the user's Documents/PDFEdit_output directory.
+        With cache=True, results are cached under output_dir/.cache by input content,
+        operation and parameters, so unchanged inputs are not processed again.
+        Timings per operation and per stage, page and byte counters and peak memory
+        are collected in self.metrics; metrics_hook, if given, receives them after
+        every operation.
+        progress, if given, is called as progress(file, pages done, pages in file)
+        while pages are copied. Setting self.cancel_event stops the running
+        operation at the next page with OperationCancelled; nothing half-written
+        is saved.
+        Parsed sources are kept in a bounded LRU cache (self.readers, sized by
+        reader_cache_bytes of source files; 0 turns it off), so opening the same
+        unchanged file again skips parsing.
+        With optimize="max", images larger than image_max_size pixels on their
+        longest side are downsampled (needs Pillow).
+        With mmap_inputs=True source files are memory-mapped instead of read,
+        so only the parts pypdf touches (the xref, the requested pages and
+        their resources) are loaded from disk. A mapped file must not be
+        truncated or rewritten in place while it is in use.
         """
+        _load_pypdf()
         if output_dir:
             self.output_dir = Path(output_dir)
         else:
@@ -23,6 +188,61 @@ class PDFEdit:
             self.output_dir = documents_dir / "PDFEdit_output"
         # Create the folder if it doesn't exist
         os.makedirs(self.output_dir, exist_ok=True)
+        self.metrics = Metrics(hook=metrics_hook)
+        self.reader_cache_bytes = reader_cache_bytes
+        self.readers = ReaderCache(reader_cache_bytes) if reader_cache_bytes else None
+        self.progress = progress
+        self.cancel_event = threading.Event()
+        # Totals of the last merge's stream dedup pass (see pdf_marge)
+        self.dedup_report = {"streams": 0, "bytes_saved": 0, "seconds": 0.0}
+        # Paths saved by the last pdf_marge call
+        self.marge_outputs = []
+        self.image_max_size = image_max_size
+        self.mmap_inputs = mmap_inputs
+        # One entry per optimized output (see __optimize)
+        self.optimize_reports = []
+        # Absolute path -> (size, mtime_ns, rejection reason or None), see validate_pdfs
+        self.__validated = {}
+        # Output folder -> names already taken in it, and next free copy-<n>
+        self.__names = {}
+        self.__next_copy = {}
+        # Page counts of inputs, kept across runs (see scan_pdfs)
+        self.page_index = PageIndex(self.output_dir / ".page-index.json")
+        # Kept so job worker processes can open the same cache (see _init_job_worker)
+        self.cache_options = (
+            {"max_bytes": cache_max_bytes, "max_age": cache_max_age} if cache else None
+        )
+        self.cache = (
+            ResultCache(
+                self.output_dir / ".cache",
+                max_bytes=cache_max_bytes,
+                max_age=cache_max_age,
+            )
+            if cache
+            else None
+        )
+
+    def __getstate__(self) -> dict:
+        # Don't ship the cache index to worker processes: job workers open the
+        # cache themselves (see _init_job_worker), and per-file tasks never use it.
+        # Workers build their own name index (the exclusive create keeps them apart)
+        state = self.__dict__.copy()
+        state["cache"] = None
+        state["metrics"] = Metrics()
+        state["readers"] = None
+        state["page_index"] = None
+        # Callbacks and events stay in this process; the parent cancels the pool
+        state["progress"] = None
+        state["cancel_event"] = None
+        state["_PDFEdit__names"] = {}
+        state["_PDFEdit__validated"] = {}
+        state["_PDFEdit__next_copy"] = {}
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        # A worker process gets the instance without running __init__
+        _load_pypdf()
+        self.__dict__.update(state)
 
     def check_pdf_extension(self, name_files: list[str]) -> tuple:
         """
@@ -30,8 +250,12 @@ class PDFEdit:
         Raises ValueError if a file does not have a .pdf extension.
         Raises FileNotFoundError if a file does not exist.
         Returns True if all files are valid.
+        Streams ("-" for stdin, bytes, file-like objects) are not checked here;
+        they are validated when parsed.
         """
         for file in name_files:
+            if not _is_path(file):
+                continue
             _, ext = os.path.splitext(file)
             if ext.lower() != ".pdf":
                 return (False, f"The file '{file}' does not have a .pdf extension.")
@@ -39,26 +263,148 @@ class PDFEdit:
                 return (False, f"The file '{file}' does not exist.")
         return (True, "")
 
+    def validate_pdfs(self, name_files: list[str]) -> tuple:
+        """
+        Check that all files are PDFs that can be opened, without parsing them.
+        After check_pdf_extension, every file's header and trailer
+        are checked in parallel, so a corrupt or truncated file is rejected up
+        front instead of deep into a batch. Results are remembered by path,
+        size and modification time, so unchanged files are checked only once.
+        Returns (True, "") or (False, reason) for the first bad file.
+        """
+        ok, message = self.check_pdf_extension(name_files)
+        if not ok:
+            return (ok, message)
+        for reason in self.__structure_problems(name_files):
+            if reason:
+                return (False, reason)
+        return (True, "")
+
+    def __structure_problems(self, name_files: list[str]) -> list[str | None]:
+        """
+        Run _check_structure over existing files in parallel, reusing earlier
+        results for unchanged files. Returns one reason (or None) per file;
+        streams are not checked.
+        """
+        todo = {}
+        for file in filter(_is_path, name_files):
+            path = os.path.abspath(file)
+            stat = os.stat(path)
+            known = self.__validated.get(path)
+            if not known or known[:2] != (stat.st_size, stat.st_mtime_ns):
+                todo[path] = (stat.st_size, stat.st_mtime_ns)
+        if todo:
+            with self.metrics.stage("validate"):
+                if len(todo) > 1:
+                    from concurrent.futures import ThreadPoolExecutor
+                    with ThreadPoolExecutor(max_workers=min(16, len(todo))) as pool:
+                        reasons = list(pool.map(_check_structure, todo))
+                else:
+                    reasons = [_check_structure(path) for path in todo]
+            for (path, stat), reason in zip(todo.items(), reasons):
+                self.__validated[path] = (*stat, reason)
+        return [
+            self.__validated[os.path.abspath(file)][2] if _is_path(file) else None
+            for file in name_files
+        ]
+
+    def scan_pdfs(self, name_files: list[str], index_only: bool = False) -> list[dict]:
+        """
+        Estimate the cost of each file: its page count and size in bytes.
+        Page counts come from the page-tree root without loading the pages,
+        and are kept in a persisted index (output_dir/.page-index.json) so
+        unchanged files are not opened again. Files are scanned in parallel.
+        Returns one {"pages", "bytes"} dict per file; pages is None for a
+        stream or a file that cannot be read, and bytes is 0 for streams.
+        With index_only, files missing from the index are not opened and
+        their pages are left as None.
+        """
+        infos = [{"pages": None, "bytes": 0} for _ in name_files]
+        todo = {}
+        for index, file in enumerate(name_files):
+            if not _is_path(file):
+                continue
+            try:
+                stat = os.stat(file)
+            except OSError:
+                continue
+            infos[index]["bytes"] = stat.st_size
+            known = self.page_index.get(file, stat) if self.page_index else None
+            if known:
+                infos[index]["pages"] = known[0]
+            elif not index_only:
+                todo.setdefault(os.path.abspath(file), (stat, []))[1].append(index)
+        if todo:
+            with self.metrics.stage("scan"):
+                from concurrent.futures import ThreadPoolExecutor
+                with ThreadPoolExecutor(max_workers=min(16, len(todo))) as pool:
+                    counts = list(pool.map(_count_pages, todo))
+            for (path, (stat, indexes)), pages in zip(todo.items(), counts):
+                for index in indexes:
+                    infos[index]["pages"] = pages
+                if self.page_index:
+                    self.page_index.put(path, stat, pages)
+            if self.page_index:
+                try:
+                    self.page_index.save()
+                except OSError:
+                    pass
+        return infos
+
     def __search_is_name_valid(self, name: str, path: str) -> str:
         """
         Check if a file name already exists in the given path.
         If it does, append 'copy-<n>' to the file name to avoid overwriting.
         Returns a valid file name as a string.
+        The folder is listed only once per instance; after that the check uses
+        an in-memory index of taken names and the next free copy number.
         """
-        count = 0
-        for file in os.listdir(path):
-            if name == file or name.replace(".pdf", f"copy-{count}.pdf") == file:
-                count += 1
-        if count == 0:
+        if path not in self.__names:
+            self.__names[path] = set(os.listdir(path))
+        taken = self.__names[path]
+        if name not in taken:
             return name
-        return name.replace(".pdf", f"copy-{count}.pdf")
+        stem, ext = os.path.splitext(name)
+        count = self.__next_copy.get((path, name), 1)
+        while f"{stem}copy-{count}{ext}" in taken:
+            count += 1
+        self.__next_copy[(path, name)] = count
+        return f"{stem}copy-{count}{ext}"
 
-    def __save_file_as_pdf(self, process: str, name: str, writer: PdfWriter) -> None:
+    def __save_file_as_pdf(
+        self,
+        process: str,
+        name: str,
+        writer: PdfWriter,
+        output=None,
+        optimize: str = "off",
+    ) -> str:
         """
         Save a PDF file using the provided PdfWriter object.
-        The output directory is determined by the process type ('rev', 'split', 'marge').
+        The output directory is determined by the process type ('rev', 'split', 'marge', 'pipeline').
         The file name is made unique if needed to avoid overwriting.
+        The PDF is written to a temp file first; the final name is claimed with an
+        exclusive create and the temp file renamed over it, so two processes
+        saving at the same moment never get the same name.
+        Returns the path of the saved file.
+        With output (a binary stream such as sys.stdout.buffer) the PDF is written
+        there instead of to disk, and output is returned in place of a path.
+        optimize ('off', 'fast' or 'max') shrinks the PDF first, see __optimize.
         """
+        report = self.__optimize(writer, optimize)
+        if output is not None:
+            with self.metrics.stage("write"):
+                # pypdf needs a seekable stream; stdout and sockets are not
+                buffer = io.BytesIO()
+                writer.write(buffer)
+                writer.close()
+                output.write(buffer.getvalue())
+                if hasattr(output, "flush"):
+                    output.flush()
+            self.metrics.count("bytes_written", buffer.tell())
+            self.metrics.count("pages", len(writer.pages))
+            self.__report_optimize(report, name, buffer.tell())
+            return output
         match process:
             case "rev":
                 output_dir = os.path.join(self.output_dir, "reverse")
@@ -69,135 +415,1363 @@ class PDFEdit:
             case "marge":
                 output_dir = os.path.join(self.output_dir, "marge")
                 os.makedirs(output_dir, exist_ok=True)
+            case "pipeline":
+                output_dir = os.path.join(self.output_dir, "pipeline")
+                os.makedirs(output_dir, exist_ok=True)
             case _:
                 output_dir = os.path.join(self.output_dir, "")
-        name_file_saved = self.__search_is_name_valid(name, output_dir)
-        with open(os.path.join(output_dir, name_file_saved), "wb") as new_file:
-            writer.write(new_file)
-            writer.close()
+        import tempfile
+        fd, temp_path = tempfile.mkstemp(dir=output_dir, prefix=".", suffix=".tmp")
+        try:
+            with self.metrics.stage("write"):
+                with os.fdopen(fd, "wb") as new_file:
+                    writer.write(new_file)
+                    writer.close()
+                    size = new_file.tell()
+                    self.metrics.count("bytes_written", size)
+            self.metrics.count("pages", len(writer.pages))
+            with self.metrics.stage("naming"):
+                while True:
+                    name_file_saved = self.__search_is_name_valid(name, output_dir)
+                    self.__names[output_dir].add(name_file_saved)
+                    saved_path = os.path.join(output_dir, name_file_saved)
+                    try:
+                        # Claim the name; fails if another process already has it
+                        os.close(
+                            os.open(saved_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                        )
+                    except FileExistsError:
+                        continue
+                    os.replace(temp_path, saved_path)
+                    self.__report_optimize(report, saved_path, size)
+                    return saved_path
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
 
-    def pdf_reverse(self, original_files: list[str]) -> bool:
+    def __optimize(self, writer: PdfWriter, level: str) -> dict | None:
         """
-        Reverse the pages of one or more PDF files.
-        For each file, creates a new PDF with pages in reverse order and saves it to the output directory.
-        Returns True if successful. Raises FileNotFoundError if a file is missing.
+        Shrink a writer's objects before it is written.
+        'fast' Flate-compresses every stream that has no filter yet (content
+        streams, raw images, embedded fonts, ...). The streams are compressed
+        on a thread pool with StreamObject.flate_encode, since zlib releases the GIL.
+        'max' compresses harder, merges identical objects, drops objects that
+        nothing refers to and, if image_max_size is set, downsamples images.
+        Returns {"streams", "bytes_before", "bytes_after", "seconds"} for the
+        stream data, or None with 'off'. Raises ValueError for an unknown level.
         """
-        if self.check_pdf_extension(original_files)[0]:
-            reverse_names = [f"reverse-{os.path.basename(f)}" for f in original_files]
-            for index in range(len(original_files)):
-                # Read the original PDF file
+        _check_optimize_level(level)
+        if level == "off":
+            return None
+        start = time.perf_counter()
+        with self.metrics.stage("optimize"):
+            bytes_before = sum(
+                len(obj._data) for obj in writer._objects if isinstance(obj, StreamObject)
+            )
+            if level == "max":
+                if self.image_max_size:
+                    self.__downsample_images(writer)
+                writer.compress_identical_objects(remove_identicals=True, remove_orphans=True)
+            raw = [
+                (index, obj)
+                for index, obj in enumerate(writer._objects)
+                if isinstance(obj, StreamObject)
+                and "/Filter" not in obj
+                and "/DecodeParms" not in obj
+            ]
+            objects = [obj for _, obj in raw]
+            zlib_level = 9 if level == "max" else 1
+            if len(raw) > 1:
+                from concurrent.futures import ThreadPoolExecutor
+
+                with ThreadPoolExecutor() as pool:
+                    compressed = list(
+                        pool.map(StreamObject.flate_encode, objects, [zlib_level] * len(objects))
+                    )
+            else:
+                compressed = [obj.flate_encode(zlib_level) for obj in objects]
+            streams = 0
+            for (index, obj), encoded in zip(raw, compressed):
+                if len(encoded._data) >= len(obj._data):
+                    continue
+                # A new object in the same slot keeps every reference to it valid
+                encoded.indirect_reference = obj.indirect_reference
+                writer._objects[index] = encoded
+                streams += 1
+            bytes_after = sum(
+                len(obj._data) for obj in writer._objects if isinstance(obj, StreamObject)
+            )
+        return {
+            "streams": streams,
+            "bytes_before": bytes_before,
+            "bytes_after": bytes_after,
+            "seconds": time.perf_counter() - start,
+        }
+
+    def __downsample_images(self, writer: PdfWriter) -> None:
+        """Shrink images larger than image_max_size pixels on their longest side."""
+        try:
+            import PIL  # noqa: F401  (pypdf needs it to decode and re-encode images)
+        except ImportError:
+            print("⚠️ Pillow is not installed: images are not downsampled")
+            return
+        limit = self.image_max_size
+        for page in writer.pages:
+            for image_file in page.images:
                 try:
-                    reader = PdfReader(original_files[index])
-                except FileNotFoundError:
-                    sys.exit(f"Not found the file {original_files[index]}")
-                writer = PdfWriter()
+                    image = image_file.image
+                    if max(image.size) > limit:
+                        image.thumbnail((limit, limit))
+                        image_file.replace(image, quality=85)
+                except Exception:
+                    # Leave images pypdf can't decode or re-encode as they are
+                    continue
+
+    def __report_optimize(self, report: dict | None, name, size: int) -> None:
+        """Print and keep the size and time trade-off of one optimized output."""
+        if report is None:
+            return
+        report = {"file": str(name), "size": size, **report}
+        self.optimize_reports.append(report)
+        print(
+            f"🗜️ Optimized {os.path.basename(str(name))}: streams "
+            f"{report['bytes_before']:,} → {report['bytes_after']:,} bytes, "
+            f"{size:,} bytes written, {report['seconds']:.2f}s"
+        )
+
+    def __run_batch(
+        self,
+        task: str,
+        files: list[str],
+        *args,
+        workers: int | None = None,
+        rejected: dict | None = None,
+    ) -> list[tuple]:
+        """
+        Run a per-file task ('reverse_file', 'split_file') over a list of files.
+        With workers > 1 the files are fanned out to a process pool.
+        Returns one (ok, path or message) tuple per file, in input order.
+        A failing file is reported in its tuple and never stops the batch;
+        files failing the structural check are reported without being parsed.
+        rejected maps file indexes to results decided up front by the caller.
+        In a process pool, the files with the most pages are started first so
+        that a few large files don't finish long after the rest.
+        """
+        results = [
+            (False, reason) if reason else None
+            for reason in self.__structure_problems(files)
+        ]
+        for index, result in (rejected or {}).items():
+            if results[index] is None:
+                results[index] = result
+        keys = [None] * len(files)
+        if self.cache:
+            # Serve unchanged inputs from the result cache
+            for index, file in enumerate(files):
+                if not _is_path(file) or results[index] is not None:
+                    continue
+                try:
+                    keys[index] = self.cache.key(task, [file], args)
+                except OSError:
+                    continue
+                cached = self.cache.get(keys[index])
+                if cached is not None:
+                    results[index] = (True, cached)
+        pending = [index for index, result in enumerate(results) if result is None]
+
+        if workers and workers > 1 and len(pending) > 1:
+            infos = self.scan_pdfs([files[index] for index in pending])
+            costs = dict(zip(pending, infos))
+            pending.sort(
+                key=lambda index: (costs[index]["pages"] or 0, costs[index]["bytes"]),
+                reverse=True,
+            )
+        todo = [files[index] for index in pending]
+
+        if workers and workers > 1 and len(todo) > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(todo)),
+                initializer=_init_task_worker,
+                initargs=(self,),
+            ) as pool:
+                futures = [
+                    pool.submit(_run_pdf_task_in_worker, task, file, args)
+                    for file in todo
+                ]
+                done = []
+                for file, future in zip(todo, futures):
+                    if self.cancel_event.is_set():
+                        for pending_future in futures:
+                            pending_future.cancel()
+                        raise OperationCancelled("Cancelled before all files were done")
+                    try:
+                        result, snapshot = future.result()
+                    except Exception as e:
+                        done.append((False, f"{file}: {e}"))
+                        continue
+                    # Fold the worker's stage timings into this instance's metrics
+                    self.metrics.merge(snapshot)
+                    done.append(result)
+        else:
+            done = [_run_pdf_task(self, task, file, args) for file in todo]
+
+        for index, result in zip(pending, done):
+            results[index] = result
+            if self.cache and keys[index] and result[0]:
+                self.cache.put(keys[index], result[1])
+        return results
+
+    def __tick(self, file: str, done: int, total: int) -> None:
+        """Report progress for one copied page and stop if the job was cancelled."""
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise OperationCancelled(f"Cancelled while processing {file}")
+        if self.progress:
+            self.progress(file, done, total)
+
+    def __source_name(self, file) -> str:
+        """File name used for the outputs of a source path or stream."""
+        if _is_path(file):
+            return os.path.basename(file)
+        if file == "-":
+            return "stdin.pdf"
+        name = getattr(file, "name", None)
+        if isinstance(name, str) and name.lower().endswith(".pdf"):
+            return os.path.basename(name)
+        return "stream.pdf"
+
+    def __read_pdf(self, file, cache: bool = True) -> PdfReader:
+        """
+        Read a PDF into memory and parse it, timing the 'open' and 'parse' stages.
+        file is a path, "-" for stdin, bytes or a binary file-like object.
+        The file handle is closed before parsing starts. With mmap_inputs the
+        file is mapped read-only instead, and pages are loaded as pypdf needs them.
+        Unchanged files are served from the reader cache unless cache is False.
+        Mapped readers are never cached: each map holds a file descriptor, so
+        callers unmap them with __release as soon as their pages are copied.
+        """
+        self.metrics.count("files")
+        cache = cache and self.readers is not None and _is_path(file) and not self.mmap_inputs
+        if cache:
+            reader = self.readers.get(file)
+            if reader is not None:
+                return reader
+        with self.metrics.stage("open"):
+            if file == "-":
+                data = sys.stdin.buffer.read()
+            elif isinstance(file, (bytes, bytearray)):
+                data = bytes(file)
+            elif not _is_path(file):
+                data = file.read()
+            else:
+                stat = os.stat(file)
+                with open(file, "rb") as source:
+                    if self.mmap_inputs and stat.st_size:
+                        # The map outlives the file handle; it is unmapped
+                        # when the reader holding it is released
+                        data = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+                    else:
+                        data = source.read()
+        with self.metrics.stage("parse"):
+            if isinstance(data, mmap.mmap):
+                self.metrics.count("bytes_mapped", len(data))
+                reader = PdfReader(data)
+            else:
+                self.metrics.count("bytes_read", len(data))
+                reader = PdfReader(io.BytesIO(data))
+            # Load the page tree here, so its cost counts as parsing
+            len(reader.pages)
+        if cache:
+            self.readers.put(file, reader, stat)
+        return reader
+
+    @staticmethod
+    def __release(reader: PdfReader) -> None:
+        """
+        Unmap a memory-mapped source now. The map holds a duplicate of the file
+        descriptor, and readers sit in reference cycles, so otherwise it would
+        stay open until the next garbage collection.
+        """
+        if isinstance(reader.stream, mmap.mmap):
+            reader.stream.close()
+
+    def __reverse_file(self, file: str, optimize: str = "off", output=None) -> tuple:
+        """
+        Reverse the pages of a single PDF file and save it to the 'reverse' folder
+        (or write it to the output stream).
+        Returns (True, saved path).
+        """
+        # Read the original PDF file
+        reader = self.__read_pdf(file)
+        try:
+            writer = PdfWriter()
+            with self.metrics.stage("copy"):
                 # Copy metadata from the original PDF
                 writer.add_metadata(reader.metadata)
-                # Reverse the pages and add table of contents
-                page_number = 0
+                # Resolve the outline once, before the pages are copied
+                outline = self.__outline_index(reader)
+                # Reverse the pages
                 num_pages = len(reader.pages)
                 for page in range(num_pages - 1, -1, -1):
-                    # Get the page object
-                    page_obj = reader.pages[page]
-                    # Add the page to the writer
-                    writer.add_page(page_obj)
-                    # Add the outline item (bookmark) to the writer
-                    if len(reader.outline) != 0:
+                    self.__tick(file, num_pages - 1 - page, num_pages)
+                    writer.add_page(reader.pages[page])
+                # Rebuild the table of contents against the new page numbers
+                created = []
+                for title, page, parent in outline:
+                    created.append(
                         writer.add_outline_item(
-                            reader.outline[page].title, page_number=page_number
+                            title,
+                            None if page is None else num_pages - 1 - page,
+                            parent=None if parent is None else created[parent],
                         )
-                        page_number += 1
-                # Write the reversed pages to a new file
-                self.__save_file_as_pdf(
-                    name=reverse_names[index], process="rev", writer=writer
-                )
-            return True
-        else:
-            return self.check_pdf_extension(original_files)
+                    )
+            self.__tick(file, num_pages, num_pages)
+            # Write the reversed pages to a new file
+            saved = self.__save_file_as_pdf(
+                name=f"reverse-{self.__source_name(file)}",
+                process="rev",
+                writer=writer,
+                output=output,
+                optimize=optimize,
+            )
+            return (True, saved)
+        finally:
+            self.__release(reader)
 
-    def pdf_split(self, original_files: list[str], from_: int, to: int) -> None:
+    def __outline_index(self, reader: PdfReader) -> list[tuple]:
         """
-        Split multiple PDF files into new PDFs containing pages from 'from_' to 'to' (inclusive).
-        GUI-friendly version: handles all files separately, skips invalid ones, and never raises exceptions.
+        Resolve the outline (bookmarks) tree of a PDF once.
+        Returns (title, page index, parent position) entries in document order,
+        where parent position is the index of the parent entry or None.
+        Parents always come before their children.
         """
-        # ✅ Check extensions first
-
-        if self.check_pdf_extension(original_files)[0]:
+        entries = []
+        # Each frame: [iterator over sibling items, parent position, last entry]
+        stack = [[iter(reader.outline), None, None]]
+        while stack:
+            frame = stack[-1]
+            item = next(frame[0], None)
+            if item is None:
+                stack.pop()
+            elif isinstance(item, list):
+                # A nested list holds the children of the entry just before it
+                parent = frame[1] if frame[2] is None else frame[2]
+                stack.append([iter(item), parent, None])
+            else:
+                page = reader.get_destination_page_number(item)
+                entries.append((item.title, page, frame[1]))
+                frame[2] = len(entries) - 1
+        return entries
 
-            # ✅ Validate range
-            if from_ > to:
-                print("⚠️ Invalid range: 'from_' must be less than or equal to 'to'")
-                return
+    def __split_file(
+        self,
+        file: str,
+        spans: list[tuple] | None,
+        chunk_size: int | None = None,
+        optimize: str = "off",
+        output=None,
+    ) -> tuple:
+        """
+        Save page ranges of a single PDF file to the 'split' folder.
+        'spans' is a list of (from_, to) tuples (1-based, inclusive, to may be None
+        for "until the last page"); with chunk_size the file is burst into
+        chunks of that many pages instead. The file is parsed once for all chunks.
+        Returns (True, list of saved paths), or (False, reason) when nothing is saved.
+        With output the single chunk is written to that stream instead.
+        """
+        try:
+            reader = self.__read_pdf(file)
+        except Exception as e:
+            print(f"❌ Cannot open file '{file}': {e}")
+            return (False, f"Cannot open file '{file}': {e}")
 
-            writer = None
-            # ✅ Loop through all files independently
-            for file in original_files:
-                try:
-                    reader = PdfReader(file)
-                except Exception as e:
-                    print(f"❌ Cannot open file '{file}': {e}")
-                    continue  # Skip this file, go to next one
-
-                total_pages = len(reader.pages)
-                if total_pages == 0:
-                    print(f"⚠️ Skipping empty file: {file}")
-                    continue
+        try:
+            total_pages = len(reader.pages)
+            if total_pages == 0:
+                print(f"⚠️ Skipping empty file: {file}")
+                return (False, f"Skipping empty file: {file}")
 
-                # ✅ Adjust 'to' if it's bigger than total pages
-                actual_to = min(to, total_pages)
+            if chunk_size:
+                spans = [
+                    (start, start + chunk_size - 1)
+                    for start in range(1, total_pages + 1, chunk_size)
+                ]
+            if output is not None and len(spans) > 1:
+                message = "Only one split range can be written to an output stream."
+                print(f"⚠️ {message}")
+                return (False, message)
 
+            saved = []
+            message = ""
+            for from_, to in spans:
                 # ✅ Skip if from_ is out of range
                 if from_ < 1 or from_ > total_pages:
-                    print(
-                        f"⚠️ Invalid 'from_' value for '{file}'. It has only {total_pages} pages."
-                    )
+                    message = f"Invalid 'from_' value for '{file}'. It has only {total_pages} pages."
+                    print(f"⚠️ {message}")
                     continue
 
-                # ✅ Create a fresh writer for each file
+                # ✅ Adjust 'to' if it's open-ended or bigger than total pages
+                actual_to = total_pages if to is None else min(to, total_pages)
+
+                # ✅ Create a fresh writer for each chunk
                 writer = PdfWriter()
-                for i in range(from_ - 1, actual_to):
-                    try:
+                with self.metrics.stage("copy"):
+                    for i in range(from_ - 1, actual_to):
+                        self.__tick(file, i, total_pages)
                         writer.add_page(reader.pages[i])
-                    except IndexError:
-                        print(f"⚠️ Page {i+1} is out of range for file: {file}")
-                        break
 
                 # ✅ Save file safely
-                new_name = f"split-{from_}-{actual_to}-{os.path.basename(file)}"
-                self.__save_file_as_pdf(name=new_name, writer=writer, process="split")
+                new_name = f"split-{from_}-{actual_to}-{self.__source_name(file)}"
+                saved.append(
+                    self.__save_file_as_pdf(
+                        name=new_name,
+                        writer=writer,
+                        process="split",
+                        output=output,
+                        optimize=optimize,
+                    )
+                )
                 print(f"✅ Split file saved as: {new_name}")
-            return writer
+            self.__tick(file, total_pages, total_pages)
+            if not saved:
+                return (False, message)
+            return (True, saved)
+        finally:
+            self.__release(reader)
+
+    def parse_page_ranges(self, expression: str) -> list[tuple]:
+        """
+        Parse a page-range expression such as "1-5,6-10,20-" or "7".
+        Returns a list of (from_, to) tuples (1-based, inclusive);
+        to is None for an open-ended range like "20-".
+        Raises ValueError if the expression is malformed.
+        """
+        spans = []
+        for part in expression.replace(" ", "").split(","):
+            start, dash, end = part.partition("-")
+            if not start.isdigit() or (end and not end.isdigit()):
+                raise ValueError(f"Invalid page range '{part}' in '{expression}'")
+            from_ = int(start)
+            to = (int(end) if end else None) if dash else from_
+            if from_ < 1 or (to is not None and to < from_):
+                raise ValueError(f"Invalid page range '{part}' in '{expression}'")
+            spans.append((from_, to))
+        return spans
+
+    def split_page_selection(self, source) -> tuple:
+        """
+        Split a merge input such as "A.pdf:1-2,5" into ("A.pdf", [(1, 2), (5, 5)]).
+        Inputs without a selection, and streams, give (source, None).
+        Only the text after the last ':' is read as a selection, and only when
+        it looks like page ranges, so paths such as "C:\\A.pdf" are left alone;
+        an existing file whose name contains ':' is always taken as a file.
+        Raises ValueError if the selection is malformed.
+        """
+        if not _is_path(source) or os.path.exists(source):
+            return (source, None)
+        file, colon, selection = str(source).rpartition(":")
+        if not colon or not file or not selection or set(selection) - set("0123456789-, "):
+            return (source, None)
+        return (file, self.parse_page_ranges(selection))
+
+    def __append_pages(self, writer: PdfWriter, reader: PdfReader, file, spans) -> None:
+        """
+        Copy the pages of reader chosen by spans (all of them when spans is None)
+        into writer, with the bookmarks that point at them. Ranges past the end
+        of the document are skipped with a warning.
+        """
+        pages = None
+        if spans is not None:
+            total = len(reader.pages)
+            pages = []
+            for from_, to in spans:
+                last = total if to is None else min(to, total)
+                if from_ > last:
+                    print(
+                        f"⚠️ Skipping range {from_}-{to or ''} of '{file}'. "
+                        f"It has only {total} pages."
+                    )
+                    continue
+                pages.extend(range(from_ - 1, last))
+            if not pages:
+                return
+        with self.metrics.stage("copy"):
+            writer.append(reader, pages=pages)
+
+    @measured("reverse")
+    def pdf_reverse(
+        self,
+        original_files: list[str],
+        workers: int | None = None,
+        output=None,
+        optimize: str = "off",
+    ) -> bool | list[tuple]:
+        """
+        Reverse the pages of one or more PDF files.
+        For each file, creates a new PDF with pages in reverse order and saves it to the output directory.
+        A file that cannot be reversed is reported and skipped. Returns True, or
+        (False, reason) when an input is not a .pdf file or does not exist.
+        With workers > 1 the files are processed in a process pool; whenever
+        workers is given, the per-file (ok, path or message) results are
+        returned in input order instead of True.
+        Inputs may also be "-" (stdin), bytes or binary file-like objects; with
+        output (a binary stream) the single reversed file is written there.
+        optimize ('off', 'fast' or 'max') shrinks each output before it is
+        written; raises ValueError for an unknown level.
+        """
+        _check_optimize_level(optimize)
+        ok, message = self.check_pdf_extension(original_files)
+        if not ok:
+            return (ok, message)
+        if output is not None:
+            if len(original_files) != 1:
+                return (False, "Only one file can be written to an output stream.")
+            results = [
+                _run_pdf_task(
+                    self, "reverse_file", original_files[0], (optimize, output)
+                )
+            ]
         else:
-            return self.check_pdf_extension(original_files)
+            results = self.__run_batch(
+                "reverse_file", original_files, optimize, workers=workers
+            )
+        for ok, message in results:
+            if not ok:
+                print(f"❌ {message}")
+        if workers is not None:
+            return results
+        return True
+
+    @measured("split")
+    def pdf_split(
+        self,
+        original_files: list[str],
+        from_: int | None = None,
+        to: int | None = None,
+        workers: int | None = None,
+        ranges: str | None = None,
+        chunk_size: int | None = None,
+        output=None,
+        optimize: str = "off",
+    ) -> list[tuple]:
+        """
+        Split multiple PDF files into new PDFs containing pages from 'from_' to 'to' (inclusive).
+        Instead of one range, 'ranges' takes an expression like "1-5,6-10,20-" and
+        'chunk_size' bursts every file into chunks of that many pages; each source
+        is parsed once and every chunk is written from that one reader.
+        GUI-friendly version: handles all files separately, skips invalid ones, and never raises exceptions.
+        Returns one (ok, saved paths or message) tuple per file, in input order.
+        With workers > 1 the files are processed in a process pool.
+        Inputs may also be "-" (stdin), bytes or binary file-like objects; with
+        output (a binary stream) the single split range is written there.
+        optimize ('off', 'fast' or 'max') shrinks each output before it is
+        written; raises ValueError for an unknown level.
+        """
+        _check_optimize_level(optimize)
+        ok, message = self.check_pdf_extension(original_files)
+        if not ok:
+            return (ok, message)
+
+        # ✅ Validate range
+        if chunk_size is not None:
+            if chunk_size < 1:
+                print("⚠️ Invalid chunk size: it must be at least 1")
+                return
+            spans = None
+        elif ranges is not None:
+            try:
+                spans = self.parse_page_ranges(ranges)
+            except ValueError as e:
+                print(f"⚠️ {e}")
+                return
+        else:
+            if from_ is None or to is None or from_ > to:
+                print("⚠️ Invalid range: 'from_' must be less than or equal to 'to'")
+                return
+            spans = [(from_, to)]
+
+        if output is not None:
+            if len(original_files) != 1:
+                return (False, "Only one file can be written to an output stream.")
+            return [
+                _run_pdf_task(
+                    self,
+                    "split_file",
+                    original_files[0],
+                    (spans, chunk_size, optimize, output),
+                )
+            ]
+
+        # ✅ Reject files none of the ranges fit, using their indexed page counts.
+        # Only a pool batch scans unknown files (it needs the counts to schedule
+        # them); otherwise __split_file checks the range on the one parse it does
+        rejected = {}
+        if spans is not None:
+            pool = bool(workers and workers > 1 and len(original_files) > 1)
+            infos = self.scan_pdfs(original_files, index_only=not pool)
+            for index, info in enumerate(infos):
+                pages = info["pages"]
+                if pages is None:
+                    # Unknown until parsed: __split_file checks it
+                    continue
+                file = original_files[index]
+                if pages == 0:
+                    message = f"Skipping empty file: {file}"
+                elif not any(1 <= from_ <= pages for from_, _ in spans):
+                    message = f"Invalid 'from_' value for '{file}'. It has only {pages} pages."
+                else:
+                    continue
+                print(f"⚠️ {message}")
+                rejected[index] = (False, message)
+
+        # ✅ Loop through all files independently
+        return self.__run_batch(
+            "split_file",
+            original_files,
+            spans,
+            chunk_size,
+            optimize,
+            workers=workers,
+            rejected=rejected,
+        )
 
-    def pdf_marge(self, pdfs: list[str]) -> PdfWriter:
+    def __dedup_streams(self, writer: PdfWriter) -> dict:
+        """
+        Write each unique stream object (fonts, images, ICC profiles, ...) once.
+        Streams are hashed by their data and dictionary, where a reference to
+        another stream counts as that stream's hash, so two images pointing at
+        separate but identical /SMask or ICC profile copies match too.
+        References to duplicates are pointed at the first copy and the
+        duplicates are dropped.
+        Returns {"streams": removed count, "bytes_saved": ..., "seconds": ...}.
+        """
+        start = time.perf_counter()
+        digests = {}
+        first_by_hash = {}
+        # idnum of a duplicate stream -> reference to the copy that is kept
+        replace = {}
+        bytes_saved = 0
+        for index, obj in enumerate(writer._objects):
+            if not isinstance(obj, StreamObject):
+                continue
+            digest = self.__stream_digest(writer, index + 1, digests)
+            kept = first_by_hash.setdefault(digest, obj.indirect_reference)
+            if kept is not obj.indirect_reference:
+                replace[index + 1] = kept
+                bytes_saved += len(obj._data)
+        for idnum in replace:
+            writer._objects[idnum - 1] = None
+        if replace:
+            for obj in writer._objects:
+                if not isinstance(obj, (DictionaryObject, ArrayObject)):
+                    continue
+                stack = [obj]
+                while stack:
+                    container = stack.pop()
+                    items = (
+                        container.items()
+                        if isinstance(container, DictionaryObject)
+                        else enumerate(container)
+                    )
+                    for key, value in list(items):
+                        if isinstance(value, IndirectObject):
+                            if value.idnum in replace:
+                                container[key] = replace[value.idnum]
+                        elif isinstance(value, (DictionaryObject, ArrayObject)):
+                            stack.append(value)
+        return {
+            "streams": len(replace),
+            "bytes_saved": bytes_saved,
+            "seconds": time.perf_counter() - start,
+        }
+
+    @staticmethod
+    def __stream_digest(writer: PdfWriter, idnum: int, digests: dict) -> bytes:
+        """
+        Hash the stream object idnum of writer by its data and dictionary.
+        Referenced streams are hashed first and stand in for their references;
+        other references count by object number. Results are kept in digests.
+        """
+        if idnum in digests:
+            # None marks a stream being hashed: a cycle falls back to the number
+            return digests[idnum] or str(idnum).encode()
+        digests[idnum] = None
+        obj = writer._objects[idnum - 1]
+
+        def canonical(value) -> str:
+            if isinstance(value, IndirectObject):
+                if value.idnum <= len(writer._objects) and isinstance(
+                    writer._objects[value.idnum - 1], StreamObject
+                ):
+                    return PDFEdit.__stream_digest(writer, value.idnum, digests).hex()
+                return f"{value.idnum} R"
+            if isinstance(value, DictionaryObject):
+                return "<<" + " ".join(
+                    f"{key} {canonical(item)}" for key, item in sorted(value.items())
+                ) + ">>"
+            if isinstance(value, ArrayObject):
+                return "[" + " ".join(canonical(item) for item in value) + "]"
+            return repr(value)
+
+        digest = hashlib.sha256(obj._data)
+        digest.update(canonical(obj).encode())
+        digests[idnum] = digest.digest()
+        return digests[idnum]
+
+    def __save_marge(
+        self,
+        name: str,
+        writer: PdfWriter,
+        dedup: bool,
+        output=None,
+        optimize: str = "off",
+    ) -> str:
+        """Save a merged writer, running the stream dedup pass first if asked."""
+        if dedup:
+            with self.metrics.stage("dedup"):
+                report = self.__dedup_streams(writer)
+            for key in ("streams", "bytes_saved", "seconds"):
+                self.dedup_report[key] += report[key]
+            print(
+                f"🧹 Dedup: {report['streams']} duplicate streams removed, "
+                f"{report['bytes_saved']} bytes saved in {report['seconds']:.3f}s"
+            )
+        return self.__save_file_as_pdf(
+            process="marge", name=name, writer=writer, output=output, optimize=optimize
+        )
+
+    def __stream_marge(
+        self,
+        pdfs: list[str],
+        selections: list,
+        max_memory: int | None,
+        dedup: bool = False,
+        output=None,
+        optimize: str = "off",
+    ) -> tuple[PdfWriter, list[str]]:
+        """
+        Merge PDF files holding at most one source open at a time.
+        Each source is closed as soon as its pages are copied into the writer.
+        pypdf keeps the whole merged document in memory until it is written,
+        so with max_memory (bytes) the output is rolled over into numbered
+        volumes ('merger-output-part-<n>.pdf') whenever the sources copied into
+        the current writer would exceed that ceiling.
+        Returns the PdfWriter of the last volume and the saved paths.
+        """
+        merger = PdfWriter()
+        saved = []
+        held = 0
+        volume = 1
+        for pdf, spans in zip(pdfs, selections):
+            size = os.path.getsize(pdf) if _is_path(pdf) else 0
+            if max_memory and held and held + size > max_memory:
+                saved.append(
+                    self.__save_marge(
+                        f"merger-output-part-{volume}.pdf",
+                        merger,
+                        dedup,
+                        optimize=optimize,
+                    )
+                )
+                merger = PdfWriter()
+                held = 0
+                volume += 1
+            # The source is read and closed before its pages are copied;
+            # it is not kept in the reader cache, so memory stays bounded
+            reader = self.__read_pdf(pdf, cache=False)
+            self.__tick(pdf, 0, len(reader.pages))
+            self.__append_pages(merger, reader, pdf, spans)
+            self.__release(reader)
+            self.__tick(pdf, len(reader.pages), len(reader.pages))
+            held += size
+        name = "merger-output.pdf" if volume == 1 else f"merger-output-part-{volume}.pdf"
+        saved.append(self.__save_marge(name, merger, dedup, output, optimize))
+        return merger, saved
+
+    def __marge_group(self, files: list[str], part_path: str, selections: list) -> tuple:
+        """
+        Merge a contiguous group of files, keeping the pages chosen by
+        selections, into part_path (one part of a parallel merge).
+        Returns (True, part_path).
+        """
+        writer = PdfWriter()
+        for file, spans in zip(files, selections):
+            reader = self.__read_pdf(file, cache=False)
+            self.__append_pages(writer, reader, file, spans)
+            self.__release(reader)
+        with self.metrics.stage("write"):
+            with open(part_path, "wb") as part:
+                writer.write(part)
+        writer.close()
+        return (True, part_path)
+
+    def __parallel_marge(
+        self, pdfs: list[str], selections: list, workers: int
+    ) -> PdfWriter:
+        """
+        Merge files on a process pool: each worker merges one contiguous group
+        (groups are balanced by page count) into a temporary part, then the
+        parts are appended in input order. Bookmarks are carried by the parts.
+        Returns the merged writer, not yet saved.
+        Raises ValueError if a group cannot be merged.
+        """
+        from concurrent.futures import ProcessPoolExecutor
+        import tempfile
+
+        costs = [info["pages"] or 1 for info in self.scan_pdfs(pdfs)]
+        groups = _contiguous_groups(costs, workers)
+        total = sum(costs)
+        merger = PdfWriter()
+        with tempfile.TemporaryDirectory(dir=self.output_dir, prefix=".marge-") as tmp:
+            parts = [os.path.join(tmp, f"part-{i}.pdf") for i in range(len(groups))]
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(groups)),
+                initializer=_init_task_worker,
+                initargs=(self,),
+            ) as pool:
+                futures = [
+                    pool.submit(
+                        _run_pdf_task_in_worker,
+                        "marge_group",
+                        [pdfs[index] for index in group],
+                        (part, [selections[index] for index in group]),
+                    )
+                    for group, part in zip(groups, parts)
+                ]
+                done = 0
+                for group, future in zip(groups, futures):
+                    (ok, message), snapshot = future.result()
+                    self.metrics.merge(snapshot)
+                    if not ok:
+                        for pending_future in futures:
+                            pending_future.cancel()
+                        raise ValueError(message)
+                    done += sum(costs[index] for index in group)
+                    try:
+                        self.__tick(pdfs[group[-1]], done, total)
+                    except OperationCancelled:
+                        for pending_future in futures:
+                            pending_future.cancel()
+                        raise
+            for part in parts:
+                with self.metrics.stage("parse"):
+                    with open(part, "rb") as source:
+                        reader = PdfReader(io.BytesIO(source.read()))
+                with self.metrics.stage("copy"):
+                    merger.append(reader)
+        return merger
+
+    @measured("marge")
+    def pdf_marge(
+        self,
+        pdfs: list[str],
+        stream: bool = False,
+        max_memory: int | None = None,
+        dedup: bool = False,
+        output=None,
+        optimize: str = "off",
+        workers: int | None = None,
+    ) -> PdfWriter:
         """
         Merge multiple PDF files into one output PDF.
         The merged file is saved to the output directory as 'merger-output.pdf'.
         Returns a PdfWriter object for the merged PDF.
         Raises ValueError if fewer than two files are provided or a file is missing.
+        With stream=True each source file is closed right after its pages are copied,
+        and max_memory (bytes) caps how much source data one output volume holds.
+        On a cache hit the writer is re-opened from the previous output.
+        With dedup=True identical streams (fonts, images, ...) are written once;
+        the bytes saved and time spent are printed and kept in self.dedup_report.
+        The saved paths are kept in self.marge_outputs.
+        Inputs may also be "-" (stdin), bytes or binary file-like objects; with
+        output (a binary stream) the merged PDF is written there instead.
+        optimize ('off', 'fast' or 'max') shrinks the output before it is written.
+        With workers > 1 (and without stream or max_memory), contiguous groups
+        of files are merged in that many processes and the parts are joined in
+        order, keeping the bookmarks.
+        An input may pick its pages, e.g. ["A.pdf:1-2", "B.pdf", "C.pdf:10-12"]
+        (see split_page_selection): only those pages are copied from the source,
+        with no intermediate split files.
         """
-        if self.check_pdf_extension(pdfs)[0]:
-            if len(pdfs) < 2:
-                raise ValueError("less than two file")
+        selected = [self.split_page_selection(pdf) for pdf in pdfs]
+        pdfs = [pdf for pdf, _ in selected]
+        selections = [spans for _, spans in selected]
+        ok, message = self.validate_pdfs(pdfs)
+        if not ok:
+            return (ok, message)
+        if len(pdfs) < 2:
+            raise ValueError("less than two file")
+        _check_optimize_level(optimize)
+        if output is not None and max_memory:
+            raise ValueError("max_memory volumes cannot be written to one output stream")
+        key = None
+        if self.cache and output is None and all(map(_is_path, pdfs)):
+            key = self.cache.key(
+                "marge", pdfs, [stream, max_memory, dedup, optimize, selections]
+            )
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.marge_outputs = cached
+                return PdfWriter(clone_from=cached[-1])
+        self.dedup_report = {"streams": 0, "bytes_saved": 0, "seconds": 0.0}
+        if stream or max_memory:
+            merger, saved = self.__stream_marge(
+                pdfs, selections, max_memory, dedup, output, optimize
+            )
+        elif workers and workers > 1 and len(pdfs) > 2 and all(map(_is_path, pdfs)):
+            merger = self.__parallel_marge(pdfs, selections, workers)
+            saved = [
+                self.__save_marge("merger-output.pdf", merger, dedup, output, optimize)
+            ]
+        else:
             # Create a PdfWriter object to write the merged PDF
             merger = PdfWriter()
             # Iterate over the list of PDF files
-            for pdf in pdfs:
+            for pdf, spans in zip(pdfs, selections):
                 # check if the file exists
                 try:
                     # Append each PDF file to the PdfWriter object
-                    merger.append(open(pdf, "rb"))
+                    reader = self.__read_pdf(pdf)
                 except FileNotFoundError:
-                    sys.exit(f"This is File Not found {pdf}")
+                    raise ValueError(f"This is File Not found {pdf}")
+                self.__tick(pdf, 0, len(reader.pages))
+                self.__append_pages(merger, reader, pdf, spans)
+                self.__release(reader)
+                self.__tick(pdf, len(reader.pages), len(reader.pages))
             # Define the output directory and file path
-            self.__save_file_as_pdf(
-                process="marge", name="merger-output.pdf", writer=merger
-            )
-            # Return the PdfWriter object containing the merged PDF
-            return merger
+            saved = [
+                self.__save_marge("merger-output.pdf", merger, dedup, output, optimize)
+            ]
+        self.marge_outputs = saved
+        if key:
+            self.cache.put(key, saved)
+        # Return the PdfWriter object containing the merged PDF
+        return merger
+
+    @measured("append")
+    def pdf_append(self, bundle: str, pdfs: list[str]) -> tuple:
+        """
+        Add the pages and bookmarks of pdfs to the end of the PDF at bundle as an
+        incremental update: only the new objects, a cross-reference stream and
+        a trailer are appended, and the bytes already in the file are left as
+        they are. The cost of writing grows with the new pages, not the bundle.
+        A bundle that doesn't exist yet is created as a plain merge.
+        If writing fails, the file is truncated back to its previous revision.
+        Returns (True, bundle) or (False, message) when an input is not a valid PDF.
+        """
+        exists = os.path.exists(bundle)
+        ok, message = self.validate_pdfs([bundle, *pdfs] if exists else pdfs)
+        if not ok:
+            return (False, message)
+        size = 0
+        if exists:
+            with open(bundle, "rb+") as file:
+                file.seek(-1, os.SEEK_END)
+                if file.read(1) not in b"\r\n":
+                    # The new revision must start on a line of its own
+                    file.write(b"\n")
+                size = file.tell()
+            bundle_reader = self.__read_pdf(bundle, cache=False)
+            writer = PdfWriter(bundle_reader, incremental=True)
         else:
-            return self.check_pdf_extension(pdfs)
+            os.makedirs(os.path.dirname(bundle) or ".", exist_ok=True)
+            writer = PdfWriter()
+        pages = 0
+        for pdf in pdfs:
+            try:
+                reader = self.__read_pdf(pdf)
+            except FileNotFoundError:
+                raise ValueError(f"This is File Not found {pdf}")
+            self.__tick(pdf, 0, len(reader.pages))
+            with self.metrics.stage("copy"):
+                writer.append(reader)
+            self.__release(reader)
+            self.__tick(pdf, len(reader.pages), len(reader.pages))
+            pages += len(reader.pages)
+        with self.metrics.stage("write"):
+            with open(bundle, "ab" if exists else "wb") as file:
+                try:
+                    writer.write(_AppendedBytes(file, size) if exists else file)
+                except BaseException:
+                    file.truncate(size)
+                    raise
+                written = file.tell() - size
+        writer.close()
+        if exists:
+            self.__release(bundle_reader)
+        self.metrics.count("bytes_written", written)
+        self.metrics.count("pages", pages)
+        print(f"✅ Appended {pages} pages to {bundle} ({written} bytes written)")
+        return (True, bundle)
+
+    @measured("pipeline")
+    def pdf_pipeline(
+        self,
+        original_files: list[str],
+        steps: list[str],
+        output=None,
+        optimize: str = "off",
+    ) -> list[str]:
+        """
+        Chain split, reverse and merge steps in memory and write only the final documents.
+        steps is a list like ["split:3-40", "rev", "marge"]:
+          'split:<ranges>' keeps the given page ranges of every document (one
+          document per range, e.g. "split:1-5,6-10"), 'rev' reverses the pages
+          of every document and 'marge' joins all documents into one.
+        Each source is parsed once; the steps only rearrange page references,
+        and the results are saved to the 'pipeline' folder. Bookmarks are not kept.
+        Returns the saved paths. Raises ValueError for an unknown or malformed step.
+        Inputs may also be "-" (stdin), bytes or binary file-like objects; with
+        output (a binary stream) the single resulting document is written there.
+        optimize ('off', 'fast' or 'max') shrinks each result before it is written.
+        """
+        _check_optimize_level(optimize)
+        ok, message = self.validate_pdfs(original_files)
+        if not ok:
+            return (False, message)
+        parsed = []
+        for step in steps:
+            operation, _, argument = step.partition(":")
+            match operation:
+                case "split":
+                    parsed.append(("split", self.parse_page_ranges(argument)))
+                case "rev" | "marge":
+                    parsed.append((operation, None))
+                case _:
+                    raise ValueError(f"Unknown pipeline step '{step}'")
+
+        key = None
+        if self.cache and output is None and all(map(_is_path, original_files)):
+            key = self.cache.key("pipeline", original_files, [steps, optimize])
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        # A document is (name, [(reader, page index), ...])
+        documents = []
+        readers = []
+        for file in original_files:
+            reader = self.__read_pdf(file)
+            readers.append(reader)
+            pages = [(reader, index) for index in range(len(reader.pages))]
+            documents.append((self.__source_name(file), pages))
+
+        for operation, spans in parsed:
+            match operation:
+                case "split":
+                    kept = []
+                    for name, pages in documents:
+                        for from_, to in spans:
+                            last = len(pages) if to is None else min(to, len(pages))
+                            if from_ > last:
+                                print(
+                                    f"⚠️ Skipping range {from_}-{to or ''} of '{name}'. "
+                                    f"It has only {len(pages)} pages."
+                                )
+                                continue
+                            kept.append(
+                                (f"split-{from_}-{last}-{name}", pages[from_ - 1 : last])
+                            )
+                    documents = kept
+                case "rev":
+                    documents = [
+                        (f"reverse-{name}", pages[::-1]) for name, pages in documents
+                    ]
+                case "marge":
+                    documents = [
+                        (
+                            "merger-output.pdf",
+                            [page for _, pages in documents for page in pages],
+                        )
+                    ]
+
+        if output is not None and len(documents) != 1:
+            raise ValueError(
+                f"The pipeline makes {len(documents)} documents; "
+                "only one can be written to an output stream"
+            )
+        saved = []
+        for name, pages in documents:
+            writer = PdfWriter()
+            with self.metrics.stage("copy"):
+                for done, (reader, index) in enumerate(pages):
+                    self.__tick(name, done, len(pages))
+                    writer.add_page(reader.pages[index])
+            saved.append(
+                self.__save_file_as_pdf(
+                    process="pipeline",
+                    name=name,
+                    writer=writer,
+                    output=output,
+                    optimize=optimize,
+                )
+            )
+        for reader in readers:
+            self.__release(reader)
+        if key:
+            self.cache.put(key, saved)
+        return saved
+
+    @measured("index")
+    def pdf_index(self, folders: list[str] | None = None, workers: int | None = None) -> dict:
+        """
+        Build or update the search index of the text of every page of the PDFs
+        under folders (default: the output directory), see pdf_index.TextIndex.
+        Text is extracted on a pool of 'workers' processes, and only new or
+        changed files are read. The index is kept in output_dir/.search-index.sqlite.
+        Returns {"indexed", "unchanged", "removed", "failed": [(path, error)]}.
+        """
+        from pdf_index import TextIndex
+
+        with TextIndex(self.output_dir / ".search-index.sqlite") as index:
+            return index.update(folders or [str(self.output_dir)], workers=workers)
+
+    def search(self, query: str) -> list[tuple[str, int]]:
+        """
+        Find the pages whose text contains every word of query, using the index
+        built by pdf_index; no PDF is opened. Returns (file, page number) pairs.
+        """
+        from pdf_index import TextIndex
+
+        with TextIndex(self.output_dir / ".search-index.sqlite") as index:
+            return index.search(query)
+
+    def run_job(self, job: dict) -> dict:
+        """
+        Run one job described by a dict, as found in a manifest line:
+        {"id": ..., "option": "rev" | "split" | "marge" | "pipeline" | "append",
+        "files": [...]} plus the option's parameters ("from_", "to", "ranges",
+        "chunk_size", "steps", "stream", "max_memory", "dedup", "optimize", "bundle").
+        Returns {"id", "option", "status": "ok" | "failed", "outputs", "error", "seconds"};
+        errors are reported in the status, never raised.
+        """
+        start = time.perf_counter()
+        report = {
+            "id": job.get("id"),
+            "option": job.get("option"),
+            "status": "failed",
+            "outputs": [],
+            "error": "",
+        }
+        files = job.get("files") or []
+        optimize = job.get("optimize", "off")
+        try:
+            match job.get("option"):
+                case "rev":
+                    results = self.pdf_reverse(files, workers=1, optimize=optimize)
+                case "split":
+                    results = self.pdf_split(
+                        files,
+                        job.get("from_"),
+                        job.get("to"),
+                        ranges=job.get("ranges"),
+                        chunk_size=job.get("chunk_size"),
+                        optimize=optimize,
+                    )
+                    if results is None:
+                        raise ValueError("Invalid split range")
+                case "marge":
+                    merged = self.pdf_marge(
+                        files,
+                        stream=job.get("stream", False),
+                        max_memory=job.get("max_memory"),
+                        dedup=job.get("dedup", False),
+                        optimize=optimize,
+                    )
+                    results = merged if isinstance(merged, tuple) else [
+                        (True, self.marge_outputs)
+                    ]
+                case "pipeline":
+                    saved = self.pdf_pipeline(
+                        files, job.get("steps") or [], optimize=optimize
+                    )
+                    results = saved if isinstance(saved, tuple) else [(True, saved)]
+                case "append":
+                    if not job.get("bundle"):
+                        raise ValueError("append needs a 'bundle' path")
+                    results = [self.pdf_append(job["bundle"], files)]
+                case option:
+                    raise ValueError(f"Unknown option '{option}'")
+            if isinstance(results, tuple):
+                # check_pdf_extension failed: (False, message)
+                raise ValueError(results[1])
+            errors = []
+            for ok, value in results:
+                if not ok:
+                    errors.append(value)
+                elif isinstance(value, str):
+                    report["outputs"].append(value)
+                else:
+                    report["outputs"].extend(value)
+            report["error"] = "; ".join(errors)
+            report["status"] = "failed" if errors else "ok"
+        except Exception as e:
+            report["error"] = str(e)
+        report["seconds"] = time.perf_counter() - start
+        return report
+
+    def run_manifest(
+        self,
+        manifest: str,
+        workers: int | None = None,
+        checkpoint: str | None = None,
+    ) -> list[dict]:
+        """
+        Run every job of a JSON-lines manifest (one run_job dict per line).
+        Jobs run on a pool of 'workers' processes, each keeping one warm PDFEdit.
+        Every finished job is appended to the checkpoint file (default:
+        '<manifest>.checkpoint'), and jobs already recorded there as ok are
+        skipped, so a crashed run resumes where it stopped.
+        With a pool, the jobs with the most pages are started first.
+        Returns one report per job, in manifest order.
+        """
+        jobs = []
+        with open(manifest) as manifest_file:
+            for number, line in enumerate(manifest_file, start=1):
+                if line.strip():
+                    job = json.loads(line)
+                    job.setdefault("id", str(number))
+                    jobs.append(job)
+
+        checkpoint = checkpoint or f"{manifest}.checkpoint"
+        finished = {}
+        if os.path.exists(checkpoint):
+            with open(checkpoint) as checkpoint_file:
+                for line in checkpoint_file:
+                    try:
+                        report = json.loads(line)
+                    except ValueError:
+                        # A line cut short by a crash
+                        continue
+                    if report.get("status") == "ok":
+                        finished[report["id"]] = report
+        todo = [job for job in jobs if job["id"] not in finished]
+        if workers and workers > 1 and len(todo) > 1:
+            # Start the biggest jobs first so they don't hold up the end of the run
+            files = [file for job in todo for file in job.get("files") or []]
+            pages = dict(zip(files, (info["pages"] or 0 for info in self.scan_pdfs(files))))
+            todo.sort(
+                key=lambda job: sum(pages[file] for file in job.get("files") or []),
+                reverse=True,
+            )
+
+        with open(checkpoint, "a") as checkpoint_file:
+
+            def record(report: dict) -> None:
+                finished[report["id"]] = report
+                checkpoint_file.write(json.dumps(report) + "\n")
+                checkpoint_file.flush()
+                os.fsync(checkpoint_file.fileno())
+
+            if workers and workers > 1 and len(todo) > 1:
+                from concurrent.futures import ProcessPoolExecutor, as_completed
+                with ProcessPoolExecutor(
+                    max_workers=min(workers, len(todo)),
+                    initializer=_init_job_worker,
+                    initargs=(self,),
+                ) as pool:
+                    futures = {pool.submit(_run_job_in_worker, job): job for job in todo}
+                    for future in as_completed(futures):
+                        try:
+                            record(future.result())
+                        except Exception as e:
+                            job = futures[future]
+                            record(
+                                {
+                                    "id": job["id"],
+                                    "option": job.get("option"),
+                                    "status": "failed",
+                                    "outputs": [],
+                                    "error": str(e),
+                                    "seconds": 0.0,
+                                }
+                            )
+            else:
+                for job in todo:
+                    record(self.run_job(job))
+        return [finished[job["id"]] for job in jobs]
+
+
+_worker_pdf_edit = None
+
+
+def _init_job_worker(pdf_edit: PDFEdit) -> None:
+    """
+    Keep one PDFEdit per worker process, with its own warm reader cache and,
+    when the parent has one, the same on-disk result cache.
+    """
+    global _worker_pdf_edit
+    _worker_pdf_edit = pdf_edit
+    if pdf_edit.reader_cache_bytes:
+        pdf_edit.readers = ReaderCache(pdf_edit.reader_cache_bytes)
+    if pdf_edit.cache_options:
+        pdf_edit.cache = ResultCache(pdf_edit.output_dir / ".cache", **pdf_edit.cache_options)
+
+
+def _run_job_in_worker(job: dict) -> dict:
+    """Run one job on the worker process's PDFEdit."""
+    return _worker_pdf_edit.run_job(job)
+
+
+def _contiguous_groups(costs: list[int], count: int) -> list[range]:
+    """
+    Cut a list of costs into at most count contiguous, non-empty groups of
+    about the same total cost. Returns the index ranges of the groups.
+    """
+    count = max(1, min(count, len(costs)))
+    target = sum(costs) / count
+    groups = []
+    start = 0
+    running = 0
+    for index, cost in enumerate(costs):
+        running += cost
+        left = len(costs) - index - 1
+        groups_left = count - len(groups) - 1
+        # Cut once this group reaches its share, keeping one file per later group
+        if groups_left and left and (
+            running >= target * (len(groups) + 1) or left == groups_left
+        ):
+            groups.append(range(start, index + 1))
+            start = index + 1
+    groups.append(range(start, len(costs)))
+    return groups
+
+
+def _run_pdf_task(pdf_edit: PDFEdit, task: str, file: str, args: tuple) -> tuple:
+    """
+    Run one private per-file PDFEdit task. Lives at module level so that
+    worker processes can unpickle it; errors are returned, not raised.
+    """
+    try:
+        return getattr(pdf_edit, f"_PDFEdit__{task}")(file, *args)
+    except OperationCancelled:
+        raise
+    except Exception as e:
+        return (False, f"{file}: {e}")
+
+
+def _init_task_worker(pdf_edit: PDFEdit) -> None:
+    """
+    Keep one PDFEdit per per-file task worker, so its index of taken output
+    names is built once per worker, not once per task.
+    """
+    global _worker_pdf_edit
+    # A forked worker gets the parent's object as is: strip it like a spawned one
+    _worker_pdf_edit = pickle.loads(pickle.dumps(pdf_edit))
+
+
+def _run_pdf_task_in_worker(task: str, file: str, args: tuple) -> tuple:
+    """
+    Run one per-file task on the worker process's PDFEdit.
+    Returns the task result and the metrics measured while running it.
+    """
+    pdf_edit = _worker_pdf_edit
+    pdf_edit.metrics.reset()
+    result = _run_pdf_task(pdf_edit, task, file, args)
+    return result, {
+        "stages": pdf_edit.metrics.stages,
+        "counters": pdf_edit.metrics.counters,
+    }
 
 
 def main() -> None:
@@ -210,55 +1784,261 @@ def main() -> None:
             "Running like this:\n"
             "for reverse: python project.py --option rev --files path/to/your/file.pdf\n"
             "for split: python project.py --option split --files path/to/your/file.pdf --from_ num1 --to num2\n"
-            "for merge: python project.py --option marge --files path/to/your/file1.pdf path/to/your/file2.pdf"
+            "   or: --ranges 1-5,6-10,20-   or: --chunk-size 5\n"
+            "for merge: python project.py --option marge --files path/to/your/file1.pdf path/to/your/file2.pdf\n"
+            "for a packet: python project.py --option marge --files A.pdf:1-2 B.pdf C.pdf:10-12\n"
+            "for a pipeline: python project.py --option pipeline --files a.pdf b.pdf --steps split:3-40 rev marge\n"
+            "for a batch: python project.py --manifest jobs.jsonl --workers 8\n"
+            "to index outputs: python project.py --option index [--files folder]\n"
+            "to search them: python project.py --option search --query 100042\n"
+            "to grow a bundle: python project.py --option append --bundle daily.pdf --files new.pdf\n"
+            "add --workers N to reverse, split or merge files in N processes\n"
+            "add --stream [--max-memory BYTES] to merge many files with bounded resources\n"
+            "use --files - to read stdin and --output - to write stdout, e.g.\n"
+            "   cat a.pdf | python project.py --option rev --files - --output - > b.pdf"
         ),
     )
 
     parser.add_argument(
         "--option",
-        required=True,
-        choices=["rev", "split", "marge"],
-        help="Choice [rev, split, marge]",
+        choices=["rev", "split", "marge", "pipeline", "append", "index", "search"],
+        help="Choice [rev, split, marge, pipeline, append, index, search]",
+    )
+    parser.add_argument(
+        "--files",
+        help='Path to the PDF file(s); "-" reads stdin. For marge, "A.pdf:1-2,5" '
+        "keeps only those pages of A.pdf",
+        nargs="+",
+    )
+    parser.add_argument(
+        "--output",
+        help='Write the single result to this file instead of the output folder; "-" writes stdout',
     )
-    parser.add_argument("--files", help="Path to the PDF file(s)", nargs="+")
     parser.add_argument(
         "--from_", type=int, help="Starting page number for split (1-based index)"
     )
     parser.add_argument(
         "--to", type=int, help="Ending page number for split (1-based index)"
     )
+    parser.add_argument(
+        "--ranges", help='Page ranges for split, e.g. "1-5,6-10,20-"'
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, help="Split into chunks of this many pages"
+    )
+    parser.add_argument(
+        "--bundle", help="PDF to add the --files to with --option append (created if missing)"
+    )
+    parser.add_argument("--query", help="Words to search for with --option search")
+    parser.add_argument(
+        "--steps",
+        nargs="+",
+        help="Pipeline steps run in memory, e.g. split:3-40 rev marge",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Merge closing each source as soon as its pages are copied",
+    )
+    parser.add_argument(
+        "--max-memory",
+        type=int,
+        help="Memory ceiling in bytes for a streaming merge; larger merges are split into volumes",
+    )
+    parser.add_argument(
+        "--dedup",
+        action="store_true",
+        help="Write identical fonts, images and other streams only once when merging",
+    )
+    parser.add_argument(
+        "--optimize",
+        choices=OPTIMIZE_LEVELS,
+        default="off",
+        help="Shrink outputs: fast compresses streams, max also drops unused objects",
+    )
+    parser.add_argument(
+        "--image-max-size",
+        type=int,
+        help="With --optimize max, downsample images to this many pixels on their longest side",
+    )
+    parser.add_argument(
+        "--mmap",
+        action="store_true",
+        help="Memory-map input files instead of reading them, e.g. to split a few pages from huge files",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Reuse earlier outputs for unchanged inputs (cached under the output folder)",
+    )
+    parser.add_argument(
+        "--metrics-json",
+        help="Write per-operation and per-stage timings and counters to this JSON file",
+    )
+    parser.add_argument(
+        "--manifest",
+        help="JSON-lines file with one job per line; runs them all on --workers processes",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        help="Checkpoint file for --manifest (default: <manifest>.checkpoint)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Number of worker processes for reverse, split and merge (default: 1)",
+    )
 
     args = parser.parse_args()
+    if args.option is None and args.manifest is None:
+        parser.error("the following arguments are required: --option")
 
     files_name: list = args.files
 
-    pdf_editing = PDFEdit()
+    output = None
+    if args.output == "-":
+        output = sys.stdout.buffer
+        # Keep stdout for the PDF bytes: status messages go to stderr
+        sys.stdout = sys.stderr
+    elif args.output:
+        output = open(args.output, "wb")
+
+    pdf_editing = PDFEdit(
+        cache=args.cache, image_max_size=args.image_max_size, mmap_inputs=args.mmap
+    )
+
+    if args.manifest:
+        # Run a whole batch of jobs in this one process (and its workers)
+        reports = pdf_editing.run_manifest(
+            args.manifest, workers=args.workers, checkpoint=args.checkpoint
+        )
+        for report in reports:
+            mark = "✅" if report["status"] == "ok" else "❌"
+            detail = report["error"] or ", ".join(report["outputs"])
+            print(f"{mark} {report['id']} {report['option']} {report['seconds']:.2f}s {detail}")
+        failed = sum(report["status"] != "ok" for report in reports)
+        print(f"{len(reports) - failed} ok, {failed} failed")
+        if failed:
+            sys.exit(1)
 
     if args.option == "rev":
         # Reverse the PDF
         try:
-            pdf_editing.pdf_reverse(files_name)
+            # Passing workers returns the per-file results (failures are printed)
+            result = pdf_editing.pdf_reverse(
+                files_name, workers=args.workers or 1, output=output, optimize=args.optimize
+            )
         except ValueError as e:
             sys.exit(f"Error: {e}")
+        if isinstance(result, tuple):
+            sys.exit(f"Error: {result[1]}")
+        if not all(ok for ok, _ in result):
+            sys.exit(1)
 
     elif args.option == "split":
         # Split the PDF
-        if args.from_ is None or args.to is None:
-            sys.exit("Error: --from and --to arguments are required for split option")
+        if args.ranges is None and args.chunk_size is None and (
+            args.from_ is None or args.to is None
+        ):
+            sys.exit(
+                "Error: --from and --to (or --ranges, or --chunk-size) arguments are required for split option"
+            )
 
         try:
             print(files_name)
-            if len(files_name) == 1:
-                pdf_editing.pdf_split(files_name, args.from_, args.to)
+            # Several files are split together only on a worker pool
+            if len(files_name) == 1 or (args.workers and output is None):
+                result = pdf_editing.pdf_split(
+                    files_name,
+                    args.from_,
+                    args.to,
+                    workers=args.workers,
+                    ranges=args.ranges,
+                    chunk_size=args.chunk_size,
+                    output=output,
+                    optimize=args.optimize,
+                )
             else:
                 sys.exit("Error: Must be one file")
 
         except ValueError as e:
             sys.exit(f"Error: {e}")
+        if isinstance(result, tuple):
+            sys.exit(f"Error: {result[1]}")
+        if result is None or not all(ok for ok, _ in result):
+            sys.exit(1)
 
     elif args.option == "marge":
         # Merge the PDFs
-        pdf_editing.pdf_marge(files_name)
+        try:
+            pdf_editing.pdf_marge(
+                files_name,
+                stream=args.stream,
+                max_memory=args.max_memory,
+                dedup=args.dedup,
+                output=output,
+                optimize=args.optimize,
+                workers=args.workers,
+            )
+        except ValueError as e:
+            sys.exit(f"Error: {e}")
+
+    elif args.option == "pipeline":
+        # Chain the steps in memory and write only the final documents
+        if not args.steps:
+            sys.exit("Error: --steps is required for pipeline option")
+        try:
+            saved = pdf_editing.pdf_pipeline(
+                files_name, args.steps, output=output, optimize=args.optimize
+            )
+        except ValueError as e:
+            sys.exit(f"Error: {e}")
+        if isinstance(saved, tuple):
+            sys.exit(f"Error: {saved[1]}")
+        if output is None:
+            for path in saved:
+                print(f"✅ Saved: {path}")
+
+    elif args.option == "append":
+        # Add the files to the bundle as an incremental update
+        if not args.bundle:
+            sys.exit("Error: --bundle is required for append option")
+        try:
+            ok, message = pdf_editing.pdf_append(args.bundle, files_name)
+        except ValueError as e:
+            sys.exit(f"Error: {e}")
+        if not ok:
+            sys.exit(f"Error: {message}")
+
+    elif args.option == "index":
+        # Index the text of the outputs (or of the given folders)
+        report = pdf_editing.pdf_index(files_name, workers=args.workers)
+        for path, error in report["failed"]:
+            print(f"❌ {path}: {error}")
+        print(
+            f"✅ Indexed {report['indexed']} files, {report['unchanged']} unchanged, "
+            f"{report['removed']} removed"
+        )
+
+    elif args.option == "search":
+        if not args.query:
+            sys.exit("Error: --query is required for search option")
+        hits = pdf_editing.search(args.query)
+        for path, page in hits:
+            print(f"{path}: page {page}")
+        if not hits:
+            print(f"No pages match '{args.query}'")
+
+    if output is not None and output is not sys.__stdout__.buffer:
+        output.close()
+
+    if pdf_editing.cache:
+        stats = pdf_editing.cache.stats()
+        print(f"Cache: {stats['hits']} hits, {stats['misses']} misses")
+
+    if args.metrics_json:
+        with open(args.metrics_json, "w") as metrics_file:
+            json.dump(pdf_editing.metrics.summary(), metrics_file, indent=2)
 
 
 if __name__ == "__main__":
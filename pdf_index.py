@@ -0,0 +1,188 @@
+from pathlib import Path
+import os
+import re
+import sqlite3
+
+TOKEN = re.compile(r"\w+")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    pages INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    file_id INTEGER NOT NULL,
+    page INTEGER NOT NULL,
+    PRIMARY KEY (term, file_id, page)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_file ON postings (file_id);
+"""
+
+
+def _terms(text: str) -> set[str]:
+    """Split text into lower-case search terms."""
+    return {token.lower() for token in TOKEN.findall(text)}
+
+
+def _extract_terms(path: str) -> tuple:
+    """
+    Extract the terms of every page of one PDF (runs in a worker process).
+    Returns (path, [sorted terms of page 1, page 2, ...], None),
+    or (path, None, error message) when the file cannot be read.
+    """
+    from pypdf import PdfReader
+
+    try:
+        reader = PdfReader(path)
+        pages = [sorted(_terms(page.extract_text() or "")) for page in reader.pages]
+        return (path, pages, None)
+    except Exception as e:
+        return (path, None, str(e))
+
+
+class TextIndex:
+    def __init__(self, db_path: str | Path):
+        """
+        Open (or create) a persistent inverted index of the text of PDF pages.
+        Each term maps to the (file, page) pairs it appears on, in a SQLite
+        database, so a search is a few B-tree lookups and never parses a PDF.
+        Files are re-indexed only when their size or modification time changes.
+        """
+        self.db_path = Path(db_path)
+        self.db = sqlite3.connect(self.db_path)
+        self.db.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.db.close()
+
+    def update(self, folders: list[str], workers: int | None = None) -> dict:
+        """
+        Bring the index up to date with every PDF under the given folders
+        (hidden folders such as '.cache' are skipped; files are accepted too).
+        Changed and new files are extracted on a pool of 'workers' processes
+        (default: one per CPU); files that disappeared are dropped.
+        Returns {"indexed", "unchanged", "removed", "failed": [(path, error)]}.
+        """
+        found = {}
+        for folder in folders:
+            for path in self.__pdfs(Path(folder)):
+                found[os.path.abspath(path)] = os.stat(path)
+        known = {
+            path: (file_id, size, mtime_ns)
+            for file_id, path, size, mtime_ns in self.db.execute(
+                "SELECT id, path, size, mtime_ns FROM files"
+            )
+        }
+        roots = [os.path.abspath(folder) for folder in folders]
+        removed = [
+            path
+            for path in known
+            if path not in found
+            and any(path == root or path.startswith(root + os.sep) for root in roots)
+        ]
+        todo = [
+            path
+            for path, stat in found.items()
+            if known.get(path, (None,))[1:] != (stat.st_size, stat.st_mtime_ns)
+        ]
+        report = {
+            "indexed": 0,
+            "unchanged": len(found) - len(todo),
+            "removed": len(removed),
+            "failed": [],
+        }
+        with self.db:
+            for path in removed:
+                self.__forget(known[path][0])
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers > 1 and len(todo) > 1:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=min(workers, len(todo))) as pool:
+                results = pool.map(_extract_terms, todo, chunksize=8)
+                self.__store(results, found, known, report)
+        else:
+            self.__store(map(_extract_terms, todo), found, known, report)
+        return report
+
+    def search(self, query: str) -> list[tuple[str, int]]:
+        """
+        Return the (file, page number) pairs whose page contains every term of
+        query, e.g. an account number or "invoice 2024". Page numbers start at 1.
+        """
+        terms = sorted(_terms(query))
+        if not terms:
+            return []
+        placeholders = ", ".join("?" for _ in terms)
+        rows = self.db.execute(
+            f"""
+            SELECT files.path, postings.page FROM postings
+            JOIN files ON files.id = postings.file_id
+            WHERE postings.term IN ({placeholders})
+            GROUP BY postings.file_id, postings.page
+            HAVING COUNT(*) = ?
+            ORDER BY files.path, postings.page
+            """,
+            (*terms, len(terms)),
+        )
+        return [(path, page + 1) for path, page in rows]
+
+    def stats(self) -> dict:
+        """Return how many files, pages and postings the index holds."""
+        files, pages = self.db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(pages), 0) FROM files"
+        ).fetchone()
+        (postings,) = self.db.execute("SELECT COUNT(*) FROM postings").fetchone()
+        return {"files": files, "pages": pages, "postings": postings}
+
+    def __store(self, results, found: dict, known: dict, report: dict) -> None:
+        # One transaction per file: an interrupted update keeps what it finished
+        for path, pages, error in results:
+            if pages is None:
+                report["failed"].append((path, error))
+                continue
+            stat = found[path]
+            with self.db:
+                if path in known:
+                    self.__forget(known[path][0])
+                file_id = self.db.execute(
+                    "INSERT INTO files (path, size, mtime_ns, pages) VALUES (?, ?, ?, ?)",
+                    (path, stat.st_size, stat.st_mtime_ns, len(pages)),
+                ).lastrowid
+                self.db.executemany(
+                    "INSERT INTO postings (term, file_id, page) VALUES (?, ?, ?)",
+                    (
+                        (term, file_id, page)
+                        for page, terms in enumerate(pages)
+                        for term in terms
+                    ),
+                )
+            report["indexed"] += 1
+
+    def __forget(self, file_id: int) -> None:
+        self.db.execute("DELETE FROM postings WHERE file_id = ?", (file_id,))
+        self.db.execute("DELETE FROM files WHERE id = ?", (file_id,))
+
+    @staticmethod
+    def __pdfs(folder: Path):
+        if folder.is_file():
+            yield folder
+            return
+        for root, dirs, files in os.walk(folder):
+            # Skip caches and temporary parts ('.cache', '.marge-...')
+            dirs[:] = [name for name in dirs if not name.startswith(".")]
+            for name in files:
+                if name.lower().endswith(".pdf") and not name.startswith("."):
+                    yield os.path.join(root, name)
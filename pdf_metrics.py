@@ -0,0 +1,102 @@
+from contextlib import contextmanager
+from functools import wraps
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+STAGES = ("open", "parse", "copy", "naming", "write")
+
+
+class Metrics:
+    def __init__(self, hook=None):
+        """
+        Collect timings and counters for PDFEdit operations.
+        Operations ('reverse', 'split', 'marge', ...) and the stages inside them
+        ('open', 'parse', 'copy', 'naming', 'write', ...) are timed separately.
+        If hook is given it is called with an event dict (the operation name,
+        its duration and the current summary) after every operation.
+        """
+        self.hook = hook
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget everything measured so far."""
+        self.operations = {}
+        self.stages = {name: {"count": 0, "seconds": 0.0} for name in STAGES}
+        self.counters = {"files": 0, "pages": 0, "bytes_read": 0, "bytes_written": 0}
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time the body of a with-block as one occurrence of a stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry = self.stages.setdefault(name, {"count": 0, "seconds": 0.0})
+            entry["count"] += 1
+            entry["seconds"] += time.perf_counter() - start
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Add amount to a counter ('files', 'pages', 'bytes_read', 'bytes_written')."""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def merge(self, snapshot: dict) -> None:
+        """Add the stages and counters measured elsewhere (e.g. in a worker process)."""
+        for name, entry in snapshot["stages"].items():
+            mine = self.stages.setdefault(name, {"count": 0, "seconds": 0.0})
+            mine["count"] += entry["count"]
+            mine["seconds"] += entry["seconds"]
+        for name, amount in snapshot["counters"].items():
+            self.count(name, amount)
+
+    def summary(self) -> dict:
+        """Return everything measured so far as a JSON-friendly dict."""
+        return {
+            "operations": {name: dict(entry) for name, entry in self.operations.items()},
+            "stages": {name: dict(entry) for name, entry in self.stages.items()},
+            "counters": dict(self.counters),
+            "peak_memory_bytes": peak_memory(),
+        }
+
+    def _finish_operation(self, name: str, seconds: float) -> None:
+        entry = self.operations.setdefault(name, {"count": 0, "seconds": 0.0})
+        entry["count"] += 1
+        entry["seconds"] += seconds
+        if self.hook:
+            self.hook({"operation": name, "seconds": seconds, **self.summary()})
+
+
+def measured(operation: str):
+    """Decorate a PDFEdit method so each call is timed as one operation."""
+
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self.metrics._finish_operation(operation, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+def peak_memory() -> int | None:
+    """
+    Peak resident memory in bytes of this process or of its largest finished
+    worker process, or None where the platform doesn't report it.
+    """
+    if resource is None:
+        return None
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
@@ -0,0 +1,207 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import json
+import os
+import statistics
+import threading
+import time
+
+from pdf_edit import PDFEdit, _init_job_worker, _run_job_in_worker
+
+
+class JobServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple = ("127.0.0.1", 8765),
+        workers: int | None = None,
+        max_pending: int = 64,
+        output_dir: str | None = None,
+        cache: bool = False,
+    ):
+        """
+        Initialize a local HTTP server that runs PDFEdit jobs on a warm pool.
+        POST /jobs takes one run_job dict as JSON and answers with its report.
+        GET /stats reports throughput and latency, GET /health answers "ok".
+        The 'workers' processes are started up front, each keeping one PDFEdit
+        (and its reader cache) for its whole life. At most max_pending jobs
+        are queued or running; more are refused with 503 so callers back off.
+        """
+        super().__init__(address, JobHandler)
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.pdf_edit = PDFEdit(output_dir=output_dir, cache=cache)
+        self.pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_job_worker,
+            initargs=(self.pdf_edit,),
+        )
+        # Start every worker now, so the first jobs don't pay for imports
+        for future in [self.pool.submit(os.getpid) for _ in range(self.workers)]:
+            future.result()
+        self.started = time.time()
+        self.pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.latencies = deque(maxlen=1000)
+        self.lock = threading.Lock()
+
+    def submit(self, job: dict) -> dict | None:
+        """
+        Run one job on the pool and wait for its report.
+        Returns None without running it when max_pending jobs are in flight.
+        """
+        with self.lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                return None
+            self.pending += 1
+        start = time.perf_counter()
+        try:
+            report = self.pool.submit(_run_job_in_worker, job).result()
+        except Exception as e:
+            report = {
+                "id": job.get("id"),
+                "option": job.get("option"),
+                "status": "failed",
+                "outputs": [],
+                "error": str(e),
+                "seconds": 0.0,
+            }
+        latency = time.perf_counter() - start
+        with self.lock:
+            self.pending -= 1
+            self.latencies.append(latency)
+            if report["status"] == "ok":
+                self.completed += 1
+            else:
+                self.failed += 1
+        report["latency"] = latency
+        return report
+
+    def stats(self) -> dict:
+        """Return job counters, throughput (jobs per second) and latency percentiles."""
+        with self.lock:
+            latencies = sorted(self.latencies)
+            finished = self.completed + self.failed
+            uptime = time.time() - self.started
+            stats = {
+                "workers": self.workers,
+                "pending": self.pending,
+                "max_pending": self.max_pending,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "uptime": uptime,
+                "throughput": finished / uptime if uptime else 0.0,
+                "latency": None,
+            }
+        if latencies:
+            stats["latency"] = {
+                "mean": statistics.fmean(latencies),
+                "p50": latencies[len(latencies) // 2],
+                "p95": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+                "max": latencies[-1],
+            }
+        return stats
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.pool.shutdown(cancel_futures=True)
+
+
+class JobHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        match self.path:
+            case "/stats":
+                self.__send(200, self.server.stats())
+            case "/health":
+                self.__send(200, {"status": "ok"})
+            case _:
+                self.__send(404, {"error": f"Unknown path '{self.path}'"})
+
+    def do_POST(self) -> None:
+        if self.path != "/jobs":
+            self.__send(404, {"error": f"Unknown path '{self.path}'"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            job = json.loads(self.rfile.read(length))
+            if not isinstance(job, dict):
+                raise ValueError("a job must be a JSON object")
+        except ValueError as e:
+            self.__send(400, {"error": f"Invalid job: {e}"})
+            return
+        report = self.server.submit(job)
+        if report is None:
+            self.__send(503, {"error": "Too many pending jobs"}, {"Retry-After": "1"})
+        else:
+            self.__send(200, report)
+
+    def log_message(self, format, *args) -> None:
+        # Keep the console for the server's own messages
+        pass
+
+    def __send(self, status: int, body: dict, headers: dict | None = None) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def main() -> None:
+    """Serve PDFEdit jobs over HTTP on localhost until interrupted."""
+    parser = argparse.ArgumentParser(
+        description="Run reverse, split, merge and pipeline jobs from a local HTTP server",
+        usage=(
+            "python pdf_server.py --port 8765 --workers 4\n"
+            "then: curl -d '{\"option\": \"rev\", \"files\": [\"a.pdf\"]}' localhost:8765/jobs\n"
+            "      curl localhost:8765/stats"
+        ),
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    parser.add_argument(
+        "--workers", type=int, help="Number of worker processes (default: CPU count)"
+    )
+    parser.add_argument(
+        "--max-pending",
+        type=int,
+        default=64,
+        help="Jobs queued or running before new ones are refused with 503",
+    )
+    parser.add_argument(
+        "--output-dir", help="Folder for the outputs (default: ~/Documents/PDFEdit_output)"
+    )
+    parser.add_argument(
+        "--cache", action="store_true", help="Reuse earlier outputs for unchanged inputs"
+    )
+    args = parser.parse_args()
+
+    server = JobServer(
+        (args.host, args.port),
+        workers=args.workers,
+        max_pending=args.max_pending,
+        output_dir=args.output_dir,
+        cache=args.cache,
+    )
+    host, port = server.server_address[:2]
+    print(f"✅ Serving on http://{host}:{port} with {server.workers} workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import argparse
+import os
+import threading
+import time
+
+from pdf_edit import OPTIMIZE_LEVELS, PDFEdit, _init_job_worker, _run_job_in_worker
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # watchdog is optional: poll the folder instead
+    FileSystemEventHandler = object
+    Observer = None
+
+
+class _Wake(FileSystemEventHandler):
+    """Wake the watcher as soon as something changes in the folder."""
+
+    def __init__(self, event: threading.Event):
+        self.event = event
+
+    def on_any_event(self, event) -> None:
+        self.event.set()
+
+
+class FolderWatcher:
+    def __init__(
+        self,
+        input_dir: str,
+        job: dict,
+        workers: int | None = None,
+        max_queue: int = 1000,
+        settle: float = 2.0,
+        poll_interval: float = 1.0,
+        output_dir: str | None = None,
+    ):
+        """
+        Initialize a watcher that runs one job on every PDF dropped into input_dir.
+        job is a run_job dict without "files", e.g. {"option": "rev"}.
+        A file is picked up once its size and modification time have not changed
+        for 'settle' seconds, so files still being written are left alone.
+        With workers > 1 the jobs run on a warm pool of that many processes,
+        and at most max_queue of them are queued at once; the rest wait in the
+        folder. Finished inputs are moved to 'processed/' or 'failed/'.
+        The folder is watched with inotify (and the like) when watchdog is
+        installed, and polled every poll_interval seconds otherwise.
+        """
+        self.input_dir = Path(input_dir)
+        self.job = job
+        self.workers = workers
+        self.max_queue = max_queue
+        self.settle = settle
+        self.poll_interval = poll_interval
+        self.processed_dir = self.input_dir / "processed"
+        self.failed_dir = self.input_dir / "failed"
+        os.makedirs(self.processed_dir, exist_ok=True)
+        os.makedirs(self.failed_dir, exist_ok=True)
+        self.pdf_edit = PDFEdit(output_dir=output_dir)
+        self.pool = None
+        if workers and workers > 1:
+            self.pool = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_job_worker,
+                initargs=(self.pdf_edit,),
+            )
+        self.wake = threading.Event()
+        self.started = time.time()
+        self.processed = 0
+        self.failed = 0
+        # path -> (size, mtime_ns, time first seen with that size and mtime)
+        self.__seen = {}
+        # future -> (path, time it was queued); at most max_queue entries
+        self.__running = {}
+        # When the next file finishes settling (None when nothing is settling)
+        self.next_settled = None
+
+    def poll_once(self, now: float | None = None) -> int:
+        """
+        Look at the folder once: queue the files that have settled and
+        move aside the inputs of finished jobs. Returns how many jobs finished.
+        """
+        now = time.time() if now is None else now
+        present = {}
+        with os.scandir(self.input_dir) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.lower().endswith(".pdf"):
+                    present[entry.path] = entry.stat()
+        # Forget files that vanished
+        for path in self.__seen.keys() - present.keys():
+            del self.__seen[path]
+
+        queued = {path for path, _ in self.__running.values()}
+        ready = []
+        deadlines = []
+        for path, stat in sorted(present.items()):
+            if path in queued:
+                continue
+            signature = (stat.st_size, stat.st_mtime_ns)
+            seen = self.__seen.get(path)
+            if seen is None or seen[:2] != signature:
+                self.__seen[path] = (*signature, now)
+                deadlines.append(now + self.settle)
+            elif now - seen[2] < self.settle:
+                deadlines.append(seen[2] + self.settle)
+            elif stat.st_size:
+                ready.append(path)
+        self.next_settled = min(deadlines, default=None)
+
+        finished = 0
+        if self.pool is None:
+            for path in ready[: self.max_queue]:
+                self.__finish(path, self.pdf_edit.run_job(self.__job_for(path)))
+                finished += 1
+            return finished
+
+        for path in ready[: self.max_queue - len(self.__running)]:
+            future = self.pool.submit(_run_job_in_worker, self.__job_for(path))
+            self.__running[future] = (path, now)
+        return self.__collect()
+
+    def run(self, stop: threading.Event | None = None) -> None:
+        """Watch the folder until stop is set (or until interrupted)."""
+        stop = stop or threading.Event()
+        observer = None
+        if Observer is not None:
+            observer = Observer()
+            observer.schedule(_Wake(self.wake), str(self.input_dir), recursive=False)
+            observer.start()
+        try:
+            while not stop.is_set():
+                self.poll_once()
+                # Wake up early on a folder event or when a file has settled,
+                # and re-check running jobs at least every poll_interval
+                timeout = self.poll_interval
+                if self.next_settled is not None:
+                    timeout = max(0.0, min(timeout, self.next_settled - time.time()))
+                self.wake.wait(timeout)
+                self.wake.clear()
+        finally:
+            if observer is not None:
+                observer.stop()
+                observer.join()
+            self.close()
+
+    def stats(self) -> dict:
+        """Return counters, queue depth and throughput (files per second)."""
+        uptime = time.time() - self.started
+        return {
+            "processed": self.processed,
+            "failed": self.failed,
+            "queued": len(self.__running),
+            "waiting": len(self.__seen) - len(self.__running),
+            "uptime": uptime,
+            "throughput": (self.processed + self.failed) / uptime if uptime else 0.0,
+        }
+
+    def close(self) -> None:
+        """Wait for running jobs to finish and stop the worker pool."""
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.__collect()
+            self.pool = None
+
+    def __collect(self) -> int:
+        """Move aside the inputs of finished pool jobs. Returns how many finished."""
+        finished = 0
+        for future in [future for future in self.__running if future.done()]:
+            path, _ = self.__running.pop(future)
+            try:
+                report = future.result()
+            except Exception as e:
+                report = {"status": "failed", "error": str(e)}
+            self.__finish(path, report)
+            finished += 1
+        return finished
+
+    def __job_for(self, path: str) -> dict:
+        return {**self.job, "id": os.path.basename(path), "files": [path]}
+
+    def __finish(self, path: str, report: dict) -> None:
+        """Move a finished input aside and count it."""
+        self.__seen.pop(path, None)
+        if report["status"] == "ok":
+            self.processed += 1
+            target = self.processed_dir
+            print(f"✅ {os.path.basename(path)}")
+        else:
+            self.failed += 1
+            target = self.failed_dir
+            print(f"❌ {os.path.basename(path)}: {report['error']}")
+        name = os.path.basename(path)
+        stem, ext = os.path.splitext(name)
+        count = 1
+        while os.path.exists(target / name):
+            name = f"{stem}copy-{count}{ext}"
+            count += 1
+        os.replace(path, target / name)
+
+
+def main() -> None:
+    """Watch a folder and run one operation on every PDF dropped into it."""
+    parser = argparse.ArgumentParser(
+        description="Reverse, split or run a pipeline on every PDF dropped into a folder",
+        usage=(
+            "python pdf_watch.py inbox --option rev --workers 4\n"
+            "python pdf_watch.py inbox --option split --ranges 1-2\n"
+            "python pdf_watch.py inbox --option pipeline --steps split:2- rev"
+        ),
+    )
+    parser.add_argument("input_dir", help="Folder to watch")
+    parser.add_argument(
+        "--option", choices=["rev", "split", "pipeline"], required=True, help="Operation"
+    )
+    parser.add_argument("--ranges", help='Page ranges for split, e.g. "1-5,6-"')
+    parser.add_argument("--chunk-size", type=int, help="Split into chunks of this many pages")
+    parser.add_argument("--steps", nargs="+", help="Pipeline steps, e.g. split:2- rev")
+    parser.add_argument(
+        "--optimize", choices=OPTIMIZE_LEVELS, default="off", help="Shrink outputs"
+    )
+    parser.add_argument("--workers", type=int, help="Number of worker processes")
+    parser.add_argument(
+        "--max-queue", type=int, default=1000, help="Most files queued at once (default: 1000)"
+    )
+    parser.add_argument(
+        "--settle",
+        type=float,
+        default=2.0,
+        help="Seconds a file must stay unchanged before it is picked up (default: 2)",
+    )
+    parser.add_argument(
+        "--poll-interval", type=float, default=1.0, help="Seconds between folder scans"
+    )
+    parser.add_argument("--output-dir", help="Folder for the outputs")
+    args = parser.parse_args()
+
+    job = {"option": args.option, "optimize": args.optimize}
+    if args.ranges:
+        job["ranges"] = args.ranges
+    if args.chunk_size:
+        job["chunk_size"] = args.chunk_size
+    if args.steps:
+        job["steps"] = args.steps
+    watcher = FolderWatcher(
+        args.input_dir,
+        job,
+        workers=args.workers,
+        max_queue=args.max_queue,
+        settle=args.settle,
+        poll_interval=args.poll_interval,
+        output_dir=args.output_dir,
+    )
+    mode = "file system events" if Observer is not None else "polling"
+    print(f"✅ Watching {args.input_dir} ({mode})")
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        pass
+    stats = watcher.stats()
+    print(
+        f"{stats['processed']} processed, {stats['failed']} failed, "
+        f"{stats['throughput']:.1f} files/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
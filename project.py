@@ -1,4 +1,12 @@
-from gui_ import PDFEditGui
+import sys
 
-app = PDFEditGui()
-app.mainloop()
+if len(sys.argv) > 1:
+    # Command-line use: never load the GUI toolkit
+    from pdf_edit import main
+
+    main()
+else:
+    from gui_ import PDFEditGui
+
+    app = PDFEditGui()
+    app.mainloop()
@@ -1,8 +1,25 @@
+import gc
+import io
+import json
 import os
+import pickle
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+import urllib.error
+import urllib.request
 import pytest
+import pdf_edit
 from pathlib import Path
 from pypdf import PdfReader, PdfWriter
-from pdf_edit import PDFEdit
+from pypdf.generic import ArrayObject, DecodedStreamObject, DictionaryObject, NameObject
+from pdf_edit import OperationCancelled, PDFEdit
+from pdf_server import JobServer
+import pdf_watch
+from pdf_watch import FolderWatcher
+from benchmarks.corpus import make_corpus, make_pdf
 
 
 # ---------------------------------------------------------------------
@@ -76,6 +93,25 @@ def test_search_is_name_valid(pdf_instance, tmp_path):
     assert "copy-" in new_name
 
 
+def test_search_is_name_valid_counts_up(tmp_path):
+    editor = PDFEdit(output_dir=tmp_path)
+    (tmp_path / "a.pdf").write_text("dummy")
+    (tmp_path / "acopy-1.pdf").write_text("dummy")
+    assert editor._PDFEdit__search_is_name_valid("a.pdf", str(tmp_path)) == "acopy-2.pdf"
+    assert editor._PDFEdit__search_is_name_valid("b.pdf", str(tmp_path)) == "b.pdf"
+
+
+def test_search_is_name_valid_uppercase_extension(tmp_path):
+    make_pdf(tmp_path / "A.PDF", pages=2)
+    editor = PDFEdit(output_dir=tmp_path / "output")
+    editor.pdf_reverse([str(tmp_path / "A.PDF")])
+    editor.pdf_reverse([str(tmp_path / "A.PDF")])
+    assert sorted(os.listdir(tmp_path / "output" / "reverse")) == [
+        "reverse-A.PDF",
+        "reverse-Acopy-1.PDF",
+    ]
+
+
 # ---------------------------------------------------------------------
 # ✅ 3. __save_file_as_pdf
 # ---------------------------------------------------------------------
@@ -90,6 +126,43 @@ def test_save_file_as_pdf(pdf_instance, tmp_path):
     assert PdfReader(output_file)
 
 
+def test_pool_worker_lists_output_folder_once(sample_pdfs, tmp_path, monkeypatch):
+    editor = PDFEdit(output_dir=tmp_path)
+    # What each pool worker does: take the instance once, then run many tasks
+    pdf_edit._init_task_worker(editor)
+    listings = []
+    real_listdir = os.listdir
+    monkeypatch.setattr(os, "listdir", lambda path: listings.append(path) or real_listdir(path))
+    for _ in range(4):
+        (ok, _), _ = pdf_edit._run_pdf_task_in_worker(
+            "reverse_file", str(sample_pdfs[1]), ("off", None)
+        )
+        assert ok
+    assert len(listings) == 1
+    assert len(os.listdir(tmp_path / "reverse")) == 4
+
+
+def test_save_file_as_pdf_claims_name_atomically(tmp_path):
+    editor = PDFEdit(output_dir=tmp_path)
+    names = []
+    for taken_elsewhere in ["xcopy-1.pdf", "xcopy-3.pdf", None]:
+        writer = PdfWriter()
+        writer.add_blank_page(width=200, height=200)
+        names.append(
+            editor._PDFEdit__save_file_as_pdf(process="split", name="x.pdf", writer=writer)
+        )
+        if taken_elsewhere:
+            # Another process grabs the next name behind this instance's back
+            (tmp_path / "split" / taken_elsewhere).write_text("other")
+    assert [os.path.basename(name) for name in names] == [
+        "x.pdf",
+        "xcopy-2.pdf",
+        "xcopy-4.pdf",
+    ]
+    assert all(PdfReader(name) for name in names)
+    assert not list((tmp_path / "split").glob(".*.tmp"))
+
+
 # ---------------------------------------------------------------------
 # ✅ 4. pdf_reverse
 # ---------------------------------------------------------------------
@@ -132,6 +205,89 @@ def test_pdf_split_multiple_files(pdf_instance, sample_pdfs):
     assert len(files) >= 2
 
 
+def test_pdf_split_workers_results_in_order(pdf_instance, sample_pdfs):
+    results = pdf_instance.pdf_split(
+        [str(sample_pdfs[0]), str(sample_pdfs[1])], from_=1, to=2, workers=2
+    )
+    assert [ok for ok, _ in results] == [True, True]
+    assert os.path.basename(results[0][1][0]).endswith(sample_pdfs[0].name)
+    assert os.path.basename(results[1][1][0]).endswith(sample_pdfs[1].name)
+
+
+def test_parse_page_ranges(pdf_instance):
+    assert pdf_instance.parse_page_ranges("1-5, 6-10,20-,7") == [
+        (1, 5),
+        (6, 10),
+        (20, None),
+        (7, 7),
+    ]
+    with pytest.raises(ValueError):
+        pdf_instance.parse_page_ranges("5-2")
+    with pytest.raises(ValueError):
+        pdf_instance.parse_page_ranges("a-b")
+
+
+def test_pdf_split_ranges(pdf_instance, sample_pdfs):
+    results = pdf_instance.pdf_split([str(sample_pdfs[0])], ranges="1-3,4-4,8-")
+    ok, paths = results[0]
+    assert ok
+    assert [len(PdfReader(path).pages) for path in paths] == [3, 1, 3]
+
+
+def test_pdf_split_chunk_size(pdf_instance, sample_pdfs):
+    results = pdf_instance.pdf_split([str(sample_pdfs[0])], chunk_size=4)
+    ok, paths = results[0]
+    assert ok
+    assert [len(PdfReader(path).pages) for path in paths] == [4, 4, 2]
+
+
+def test_pdf_reverse_remaps_nested_outline(pdf_instance, tmp_path):
+    source = tmp_path / "outlined.pdf"
+    writer = PdfWriter()
+    for _ in range(6):
+        writer.add_blank_page(width=300, height=300)
+    chapter = writer.add_outline_item("Chapter 1", 0)
+    writer.add_outline_item("Section 1.1", 1, parent=chapter)
+    section = writer.add_outline_item("Section 1.2", 2, parent=chapter)
+    writer.add_outline_item("Section 1.2.1", 3, parent=section)
+    writer.add_outline_item("Chapter 2", 5)
+    with open(source, "wb") as f:
+        writer.write(f)
+
+    results = pdf_instance.pdf_reverse([str(source)], workers=1)
+    reader = PdfReader(results[0][1])
+
+    def titles_and_pages(items):
+        return [
+            titles_and_pages(item)
+            if isinstance(item, list)
+            else (item.title, reader.get_destination_page_number(item))
+            for item in items
+        ]
+
+    assert titles_and_pages(reader.outline) == [
+        ("Chapter 1", 5),
+        [("Section 1.1", 4), ("Section 1.2", 3), [("Section 1.2.1", 2)]],
+        ("Chapter 2", 0),
+    ]
+
+
+def test_pdf_reverse_workers_keeps_going(pdf_instance, sample_pdfs, tmp_path):
+    broken = tmp_path / "broken.pdf"
+    broken.write_bytes(b"not really a pdf")
+    files = [str(sample_pdfs[0]), str(broken), str(sample_pdfs[1])]
+    results = pdf_instance.pdf_reverse(files, workers=2)
+    assert [ok for ok, _ in results] == [True, False, True]
+    assert len(PdfReader(results[2][1]).pages) == 5
+
+
+def test_pdf_reverse_same_name_no_collision(pdf_instance, sample_pdfs):
+    results = pdf_instance.pdf_reverse([str(sample_pdfs[1])] * 4, workers=4)
+    paths = [path for _, path in results]
+    assert len(set(paths)) == 4
+    assert all(os.path.exists(path) for path in paths)
+
+
 # ---------------------------------------------------------------------
 # ✅ 6. pdf_marge
 # ---------------------------------------------------------------------
@@ -157,3 +313,832 @@ def test_pdf_marge_invalid_ext(pdf_instance, sample_pdfs):
 def test_pdf_marge_one_file(pdf_instance, sample_pdfs):
     with pytest.raises(ValueError):
         pdf_instance.pdf_marge([str(sample_pdfs[0])])
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs /proc")
+@pytest.mark.parametrize("mmap_inputs", [False, True])
+def test_pdf_marge_stream_bounded(tmp_path, monkeypatch, mmap_inputs):
+    blank = PdfWriter()
+    blank.add_blank_page(width=200, height=200)
+    buffer = io.BytesIO()
+    blank.write(buffer)
+    sources = []
+    for i in range(2000):
+        source = tmp_path / f"synthetic-{i}.pdf"
+        source.write_bytes(buffer.getvalue())
+        sources.append(str(source))
+
+    open_fds = []
+    real_reader = pdf_edit.PdfReader
+
+    def counting_reader(*args, **kwargs):
+        open_fds.append(len(os.listdir("/proc/self/fd")))
+        return real_reader(*args, **kwargs)
+
+    monkeypatch.setattr(pdf_edit, "PdfReader", counting_reader)
+    editor = PDFEdit(output_dir=tmp_path / "output", mmap_inputs=mmap_inputs)
+    fds_before = len(os.listdir("/proc/self/fd"))
+    tracemalloc.start()
+    # Descriptors must be closed right away, not by a later garbage collection
+    gc.disable()
+    try:
+        editor.pdf_marge(sources, stream=True, max_memory=100 * len(buffer.getvalue()))
+    finally:
+        gc.enable()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert max(open_fds) <= fds_before + 2
+    assert len(os.listdir("/proc/self/fd")) == fds_before
+    assert peak < 32 * 1024 * 1024
+    volumes = list((tmp_path / "output" / "marge").glob("merger-output-part-*.pdf"))
+    assert len(volumes) == 20
+    assert sum(len(real_reader(volume).pages) for volume in volumes) == 2000
+
+
+
+def make_invoice(path, logo: bytes, mask: bytes = b"", profile: bytes = b"") -> None:
+    """
+    Write a one-page PDF that embeds 'logo' as an image XObject, with its
+    own copy of an /SMask and an ICC profile stream when mask and profile are given.
+    """
+    writer = PdfWriter()
+    page = writer.add_blank_page(width=200, height=200)
+    image = DecodedStreamObject()
+    image.set_data(logo)
+    image.update(
+        {
+            NameObject("/Type"): NameObject("/XObject"),
+            NameObject("/Subtype"): NameObject("/Image"),
+        }
+    )
+    if mask:
+        smask = DecodedStreamObject()
+        smask.set_data(mask)
+        smask[NameObject("/Subtype")] = NameObject("/Image")
+        image[NameObject("/SMask")] = writer._add_object(smask)
+    if profile:
+        icc = DecodedStreamObject()
+        icc.set_data(profile)
+        image[NameObject("/ColorSpace")] = ArrayObject(
+            [NameObject("/ICCBased"), writer._add_object(icc)]
+        )
+    page[NameObject("/Resources")] = DictionaryObject(
+        {
+            NameObject("/XObject"): DictionaryObject(
+                {NameObject("/Im0"): writer._add_object(image)}
+            )
+        }
+    )
+    with open(path, "wb") as f:
+        writer.write(f)
+
+
+def test_pdf_marge_dedup_follows_references(tmp_path):
+    logo, mask, profile = os.urandom(30000), os.urandom(10000), os.urandom(3000)
+    invoices = []
+    for i in range(4):
+        invoices.append(str(tmp_path / f"invoice-{i}.pdf"))
+        make_invoice(invoices[-1], logo, mask, profile)
+
+    editor = PDFEdit(output_dir=tmp_path / "output")
+    editor.pdf_marge(invoices, dedup=True)
+    # The logos match once their /SMask and ICC profile copies do
+    assert editor.dedup_report["streams"] == 3 * 3
+    assert editor.dedup_report["bytes_saved"] == 3 * (len(logo) + len(mask) + len(profile))
+    reader = PdfReader(tmp_path / "output" / "marge" / "merger-output.pdf")
+    images = [page["/Resources"]["/XObject"]["/Im0"] for page in reader.pages]
+    assert len({image.indirect_reference.idnum for image in images}) == 1
+    assert images[0]["/SMask"].get_object().get_data() == mask
+    assert images[0]["/ColorSpace"][1].get_object().get_data() == profile
+
+
+def test_pdf_marge_dedup(tmp_path):
+    logo = os.urandom(20000)
+    invoices = []
+    for i in range(5):
+        invoices.append(str(tmp_path / f"invoice-{i}.pdf"))
+        make_invoice(invoices[-1], logo)
+
+    plain = PDFEdit(output_dir=tmp_path / "plain")
+    plain.pdf_marge(invoices)
+    deduped = PDFEdit(output_dir=tmp_path / "deduped")
+    deduped.pdf_marge(invoices, dedup=True)
+
+    assert deduped.dedup_report["streams"] == 4
+    assert deduped.dedup_report["bytes_saved"] == 4 * len(logo)
+    plain_file = tmp_path / "plain" / "marge" / "merger-output.pdf"
+    deduped_file = tmp_path / "deduped" / "marge" / "merger-output.pdf"
+    assert os.path.getsize(deduped_file) < os.path.getsize(plain_file) - 3 * len(logo)
+    reader = PdfReader(deduped_file)
+    assert len(reader.pages) == 5
+    for page in reader.pages:
+        assert page["/Resources"]["/XObject"]["/Im0"].get_data() == logo
+
+# ---------------------------------------------------------------------
+# ✅ 7. result cache
+# ---------------------------------------------------------------------
+def test_cache_reuses_outputs(sample_pdfs, tmp_path):
+    editor = PDFEdit(output_dir=tmp_path / "output", cache=True)
+    first = editor.pdf_reverse([str(sample_pdfs[0])], workers=1)
+    second = editor.pdf_reverse([str(sample_pdfs[0])], workers=1)
+    assert first == second
+    assert len(list((tmp_path / "output" / "reverse").iterdir())) == 1
+    assert editor.cache.stats()["hits"] == 1
+    assert editor.cache.stats()["misses"] == 1
+
+    # A deleted output is restored from the cache
+    os.remove(first[0][1])
+    assert editor.pdf_reverse([str(sample_pdfs[0])], workers=1) == first
+    assert len(PdfReader(first[0][1]).pages) == 10
+
+    # Different parameters are a different entry
+    editor.pdf_split([str(sample_pdfs[0])], from_=1, to=2)
+    editor.pdf_split([str(sample_pdfs[0])], from_=1, to=3)
+    assert editor.cache.stats()["misses"] == 3
+
+
+def test_cache_merge_hit_and_eviction(sample_pdfs, tmp_path):
+    editor = PDFEdit(output_dir=tmp_path / "output", cache=True)
+    files = [str(sample_pdfs[0]), str(sample_pdfs[1])]
+    editor.pdf_marge(files)
+    merged = editor.pdf_marge(files)
+    assert merged.get_num_pages() == 15
+    assert editor.cache.hits == 1
+
+    editor.cache.max_bytes = 0
+    editor.cache.evict()
+    assert editor.cache.stats()["entries"] == 0
+
+
+def test_cache_keeps_original_when_output_changes(sample_pdfs, tmp_path):
+    editor = PDFEdit(output_dir=tmp_path / "output", cache=True)
+    files = [str(sample_pdfs[0]), str(sample_pdfs[1])]
+    editor.pdf_marge(files)
+    [merged] = editor.marge_outputs
+    # Grow the output in place: the cached result must not grow with it
+    editor.pdf_append(merged, [str(sample_pdfs[1])])
+    assert len(PdfReader(merged).pages) == 20
+
+    assert editor.pdf_marge(files).get_num_pages() == 15
+    assert editor.cache.hits == 1
+    [served] = editor.marge_outputs
+    assert served != merged
+    assert len(PdfReader(served).pages) == 15
+
+
+# ---------------------------------------------------------------------
+# ✅ 8. benchmark corpus
+# ---------------------------------------------------------------------
+def test_make_corpus(tmp_path):
+    files = make_corpus(tmp_path, files=3, pages=6, outline_depth=3, images=2, fonts=1)
+    assert len(files) == 3
+    reader = PdfReader(files[-1])
+    assert len(reader.pages) == 6
+    assert len(reader.pages[0]["/Resources"]["/XObject"]) == 2
+    assert "account 100000" in reader.pages[0].extract_text()
+    # Two chains of three nested bookmarks
+    assert len(reader.outline) == 4
+
+
+# ---------------------------------------------------------------------
+# ✅ 9. metrics
+# ---------------------------------------------------------------------
+def test_metrics_stages_counters_and_hook(sample_pdfs, tmp_path):
+    events = []
+    editor = PDFEdit(output_dir=tmp_path, metrics_hook=events.append)
+    editor.pdf_reverse([str(sample_pdfs[0]), str(sample_pdfs[1])], workers=2)
+    editor.pdf_marge([str(sample_pdfs[0]), str(sample_pdfs[1])])
+
+    summary = editor.metrics.summary()
+    assert [event["operation"] for event in events] == ["reverse", "marge"]
+    assert summary["operations"]["reverse"]["count"] == 1
+    for stage in ("open", "parse", "copy", "naming", "write"):
+        assert summary["stages"][stage]["count"] >= 3
+    # 15 pages reversed in the workers, 15 merged here
+    assert summary["counters"]["pages"] == 30
+    assert summary["counters"]["files"] == 4
+    assert summary["counters"]["bytes_written"] > 0
+
+
+# ---------------------------------------------------------------------
+# ✅ 10. progress and cancel
+# ---------------------------------------------------------------------
+def test_progress_reports_pages(sample_pdfs, tmp_path):
+    calls = []
+    editor = PDFEdit(output_dir=tmp_path, progress=lambda *args: calls.append(args))
+    editor.pdf_reverse([str(sample_pdfs[1])])
+    assert calls[0] == (str(sample_pdfs[1]), 0, 5)
+    assert calls[-1] == (str(sample_pdfs[1]), 5, 5)
+
+
+def test_cancel_stops_without_saving(sample_pdfs, tmp_path):
+    def cancel_on_third_page(file, done, total):
+        if done == 3:
+            editor.cancel_event.set()
+
+    editor = PDFEdit(output_dir=tmp_path, progress=cancel_on_third_page)
+    with pytest.raises(OperationCancelled):
+        editor.pdf_split([str(sample_pdfs[0]), str(sample_pdfs[1])], from_=1, to=10)
+    assert not list((tmp_path / "split").glob("*.pdf"))
+
+
+# ---------------------------------------------------------------------
+# ✅ 11. pipeline
+# ---------------------------------------------------------------------
+def test_pdf_pipeline_split_reverse_merge(tmp_path):
+    sources = []
+    for name, count in (("a.pdf", 6), ("b.pdf", 4)):
+        writer = PdfWriter()
+        for width in range(100, 100 + count):
+            writer.add_blank_page(width=width, height=300)
+        sources.append(str(tmp_path / name))
+        with open(sources[-1], "wb") as f:
+            writer.write(f)
+
+    editor = PDFEdit(output_dir=tmp_path / "output")
+    saved = editor.pdf_pipeline(sources, ["split:2-4", "rev", "marge"])
+
+    assert [os.path.basename(path) for path in saved] == ["merger-output.pdf"]
+    widths = [int(page.mediabox.width) for page in PdfReader(saved[0]).pages]
+    assert widths == [103, 102, 101, 103, 102, 101]
+    # Nothing but the final document was written
+    assert sorted(os.listdir(tmp_path / "output")) == ["pipeline"]
+    # Each source was parsed once
+    assert editor.metrics.stages["parse"]["count"] == 2
+
+
+def test_pdf_pipeline_unknown_step(pdf_instance, sample_pdfs):
+    with pytest.raises(ValueError):
+        pdf_instance.pdf_pipeline([str(sample_pdfs[0])], ["shuffle"])
+
+
+# ---------------------------------------------------------------------
+# ✅ 12. reader cache
+# ---------------------------------------------------------------------
+def test_reader_cache_hits_and_invalidates(sample_pdfs, tmp_path):
+    source = tmp_path / "source.pdf"
+    source.write_bytes(sample_pdfs[0].read_bytes())
+    editor = PDFEdit(output_dir=tmp_path / "output")
+    editor.pdf_split([str(source)], from_=1, to=2)
+    editor.pdf_split([str(source)], from_=3, to=4)
+    editor.pdf_reverse([str(source)])
+    assert editor.readers.stats()["hits"] == 2
+    assert editor.readers.stats()["misses"] == 1
+    assert editor.metrics.stages["parse"]["count"] == 1
+
+    # A changed file is parsed again
+    source.write_bytes(sample_pdfs[1].read_bytes())
+    results = editor.pdf_split([str(source)], from_=1, to=10)
+    assert len(PdfReader(results[0][1][0]).pages) == 5
+    assert editor.readers.stats()["misses"] == 2
+
+
+def test_reader_cache_memory_bound(sample_pdfs, tmp_path):
+    size = os.path.getsize(sample_pdfs[0])
+    editor = PDFEdit(output_dir=tmp_path, reader_cache_bytes=size)
+    editor.pdf_reverse([str(sample_pdfs[0])])
+    editor.pdf_reverse([str(sample_pdfs[1])])
+    stats = editor.readers.stats()
+    assert stats["entries"] == 1
+    assert stats["bytes"] <= size
+
+
+# ---------------------------------------------------------------------
+# ✅ 13. manifest batches
+# ---------------------------------------------------------------------
+def test_run_manifest_resumes(sample_pdfs, tmp_path):
+    missing = tmp_path / "later.pdf"
+    jobs = [
+        {"id": "r", "option": "rev", "files": [str(sample_pdfs[0])]},
+        {"id": "s", "option": "split", "files": [str(sample_pdfs[0])], "ranges": "1-2,3-"},
+        {"id": "m", "option": "marge", "files": [str(sample_pdfs[1]), str(missing)]},
+    ]
+    manifest = tmp_path / "jobs.jsonl"
+    manifest.write_text("\n".join(json.dumps(job) for job in jobs))
+    editor = PDFEdit(output_dir=tmp_path / "output")
+
+    reports = editor.run_manifest(str(manifest), workers=2)
+    assert [report["status"] for report in reports] == ["ok", "ok", "failed"]
+    assert len(reports[1]["outputs"]) == 2
+    assert "does not exist" in reports[2]["error"]
+
+    # The second run only retries the job that failed
+    missing.write_bytes(sample_pdfs[0].read_bytes())
+    reports = editor.run_manifest(str(manifest))
+    assert [report["status"] for report in reports] == ["ok", "ok", "ok"]
+    assert len(PdfReader(reports[2]["outputs"][0]).pages) == 15
+    lines = (tmp_path / "jobs.jsonl.checkpoint").read_text().splitlines()
+    assert [json.loads(line)["id"] for line in lines].count("r") == 1
+    assert len(lines) == 4
+
+
+def test_job_workers_open_result_cache(sample_pdfs, tmp_path):
+    editor = PDFEdit(output_dir=tmp_path / "output", cache=True)
+    # Spawned workers get a pickled copy, which leaves the cache index behind
+    worker = pickle.loads(pickle.dumps(editor))
+    assert worker.cache is None
+    pdf_edit._init_job_worker(worker)
+    assert worker.cache is not None
+
+    # An entry stored by one process is found by another one sharing the folder
+    [(_, saved)] = worker.pdf_reverse([str(sample_pdfs[1])], workers=1)
+    assert editor.pdf_reverse([str(sample_pdfs[1])], workers=1) == [(True, saved)]
+    assert editor.cache.stats()["hits"] == 1
+
+
+# ---------------------------------------------------------------------
+# ✅ 14. streams
+# ---------------------------------------------------------------------
+def test_reverse_stream_to_stream(sample_pdfs, tmp_path):
+    editor = PDFEdit(output_dir=tmp_path)
+    output = io.BytesIO()
+    source = io.BytesIO(sample_pdfs[1].read_bytes())
+    assert editor.pdf_reverse([source], output=output) is True
+    assert len(PdfReader(io.BytesIO(output.getvalue())).pages) == 5
+    assert not (tmp_path / "reverse").exists()
+
+
+def test_split_and_marge_bytes_to_stream(sample_pdfs, tmp_path):
+    editor = PDFEdit(output_dir=tmp_path)
+    data = sample_pdfs[0].read_bytes()
+    output = io.BytesIO()
+    assert editor.pdf_split([data], ranges="2-4", output=output)[0][0] is True
+    assert len(PdfReader(io.BytesIO(output.getvalue())).pages) == 3
+
+    # Only one result fits in a stream
+    ok, _ = editor.pdf_split([data], ranges="1-2,3-4", output=io.BytesIO())[0]
+    assert ok is False
+
+    output = io.BytesIO()
+    editor.pdf_marge([data, str(sample_pdfs[1])], output=output)
+    assert len(PdfReader(io.BytesIO(output.getvalue())).pages) == 15
+    assert not (tmp_path / "marge").exists()
+
+
+def test_cli_stdin_to_stdout(sample_pdfs, tmp_path):
+    result = subprocess.run(
+        [sys.executable, pdf_edit.__file__, "--option", "rev", "--files", "-", "--output", "-"],
+        input=sample_pdfs[0].read_bytes(),
+        capture_output=True,
+        cwd=tmp_path,
+    )
+    assert result.returncode == 0
+    assert len(PdfReader(io.BytesIO(result.stdout)).pages) == 10
+
+
+def run_cli(tmp_path, *args):
+    """Run the CLI with its default output folder under tmp_path."""
+    return subprocess.run(
+        [sys.executable, pdf_edit.__file__, *args],
+        capture_output=True,
+        text=True,
+        cwd=tmp_path,
+        env={**os.environ, "HOME": str(tmp_path)},
+    )
+
+
+def test_cli_exit_status_and_split_workers(sample_pdfs, tmp_path):
+    (tmp_path / "bad.pdf").write_bytes(b"%PDF-1.7\nnot a pdf")
+    assert run_cli(tmp_path, "--option", "rev", "--files", "bad.pdf").returncode == 1
+    good = run_cli(tmp_path, "--option", "rev", "--files", str(sample_pdfs[0]))
+    assert good.returncode == 0
+
+    files = [str(sample_pdfs[0]), str(sample_pdfs[1])]
+    result = run_cli(
+        tmp_path, "--option", "split", "--files", *files, "--ranges", "1-2", "--workers", "2"
+    )
+    assert result.returncode == 0
+    split_dir = tmp_path / "Documents" / "PDFEdit_output" / "split"
+    assert sorted(os.listdir(split_dir)) == ["split-1-2-sample1.pdf", "split-1-2-sample2.pdf"]
+    result = run_cli(tmp_path, "--option", "split", "--files", *files, "--ranges", "1-2")
+    assert result.returncode == 1 and "Must be one file" in result.stderr
+
+
+# ---------------------------------------------------------------------
+# ✅ 15. job server
+# ---------------------------------------------------------------------
+def test_job_server(sample_pdfs, tmp_path):
+    server = JobServer(("127.0.0.1", 0), workers=1, output_dir=str(tmp_path), cache=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    def post(job):
+        request = urllib.request.Request(f"{url}/jobs", data=json.dumps(job).encode())
+        with urllib.request.urlopen(request) as response:
+            return json.load(response)
+
+    try:
+        report = post({"id": "a", "option": "rev", "files": [str(sample_pdfs[1])]})
+        assert report["status"] == "ok"
+        assert len(PdfReader(report["outputs"][0]).pages) == 5
+        # The warm workers share the result cache: the same job is a hit
+        again = post({"id": "b", "option": "rev", "files": [str(sample_pdfs[1])]})
+        assert again["outputs"] == report["outputs"]
+        assert post({"option": "rev", "files": ["missing.pdf"]})["status"] == "failed"
+
+        # Backpressure: a full queue refuses new jobs
+        server.max_pending = 0
+        with pytest.raises(urllib.error.HTTPError) as error:
+            post({"option": "rev", "files": [str(sample_pdfs[1])]})
+        assert error.value.code == 503
+
+        with urllib.request.urlopen(f"{url}/stats") as response:
+            stats = json.load(response)
+        assert (stats["completed"], stats["failed"], stats["rejected"]) == (2, 1, 1)
+        assert stats["latency"]["max"] > 0
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+# ---------------------------------------------------------------------
+# ✅ 16. structural validation
+# ---------------------------------------------------------------------
+def test_validate_pdfs(sample_pdfs, tmp_path):
+    editor = PDFEdit(output_dir=tmp_path / "output")
+    data = sample_pdfs[0].read_bytes()
+    truncated = tmp_path / "truncated.pdf"
+    truncated.write_bytes(data[: len(data) // 2])
+    files = [str(sample_pdfs[0]), str(sample_pdfs[1])]
+    assert editor.validate_pdfs(files) == (True, "")
+
+    ok, message = editor.validate_pdfs(files + [str(truncated)])
+    assert not ok and "truncated" in message
+    ok, message = editor.pdf_marge([str(sample_pdfs[0]), str(truncated)])
+    assert not ok and "truncated" in message
+
+    # Results are kept per path until the file changes
+    truncated.write_bytes(data)
+    assert editor.validate_pdfs([str(truncated)]) == (True, "")
+    assert editor.metrics.stages["validate"]["count"] == 3
+
+
+def test_validate_pdfs_leaves_recoverable_files_to_pypdf(sample_pdfs, tmp_path):
+    editor = PDFEdit(output_dir=tmp_path / "output")
+    data = sample_pdfs[1].read_bytes()
+    # A comment before the xref table puts startxref a few bytes off
+    shifted = tmp_path / "shifted.pdf"
+    position = data.rindex(b"\nxref") + 1
+    shifted.write_bytes(data[:position] + b"% edited\n" + data[position:])
+    # Padding after %%EOF, as some upload tools add
+    padded = tmp_path / "padded.pdf"
+    padded.write_bytes(data + b"\0" * 4096)
+    files = [str(shifted), str(padded)]
+    assert editor.validate_pdfs(files) == (True, "")
+    results = editor.pdf_reverse(files, workers=1)
+    assert [ok for ok, _ in results] == [True, True]
+    assert all(len(PdfReader(path).pages) == 5 for _, path in results)
+
+
+def test_reverse_reports_bad_structure_per_file(sample_pdfs, tmp_path):
+    editor = PDFEdit(output_dir=tmp_path / "output")
+    broken = tmp_path / "broken.pdf"
+    broken.write_bytes(sample_pdfs[1].read_bytes().replace(b"startxref", b"startxrXf"))
+    results = editor.pdf_reverse([str(broken), str(sample_pdfs[1])], workers=1)
+    assert results[0] == (False, f"The file '{broken}' is damaged (no startxref).")
+    assert results[1][0] is True
+    # The broken file was never parsed
+    assert editor.metrics.counters["files"] == 1
+
+
+# ---------------------------------------------------------------------
+# ✅ 17. page-count index
+# ---------------------------------------------------------------------
+def test_scan_pdfs_persists(sample_pdfs, tmp_path):
+    files = [str(sample_pdfs[0]), str(sample_pdfs[1]), str(tmp_path / "missing.pdf")]
+    infos = PDFEdit(output_dir=tmp_path).scan_pdfs(files)
+    assert [info["pages"] for info in infos] == [10, 5, None]
+    assert infos[0]["bytes"] == os.path.getsize(sample_pdfs[0])
+
+    # A new instance answers from the index on disk without opening the files
+    editor = PDFEdit(output_dir=tmp_path)
+    assert editor.scan_pdfs(files[:2]) == infos[:2]
+    assert "scan" not in editor.metrics.stages
+
+
+def test_split_rejects_ranges_up_front(sample_pdfs, tmp_path):
+    editor = PDFEdit(output_dir=tmp_path)
+    editor.scan_pdfs([str(sample_pdfs[1])])
+    results = editor.pdf_split([str(sample_pdfs[1])], ranges="8-9", workers=1)
+    assert results == [
+        (False, f"Invalid 'from_' value for '{sample_pdfs[1]}'. It has only 5 pages.")
+    ]
+    # Rejected without parsing the file
+    assert editor.metrics.counters["files"] == 0
+
+
+def test_split_parses_each_file_once(sample_pdfs, tmp_path, monkeypatch):
+    readers = []
+    real_reader = pdf_edit.PdfReader
+
+    def counting_reader(*args, **kwargs):
+        readers.append(args)
+        return real_reader(*args, **kwargs)
+
+    monkeypatch.setattr(pdf_edit, "PdfReader", counting_reader)
+    editor = PDFEdit(output_dir=tmp_path / "output")
+    [(ok, saved)] = editor.pdf_split([str(sample_pdfs[0])], ranges="1-5,6-10")
+    assert ok and len(saved) == 2
+    assert len(readers) == 1
+    # Without a pool there is nothing to schedule, so no index is written
+    assert not (tmp_path / "output" / ".page-index.json").exists()
+
+
+# ---------------------------------------------------------------------
+# ✅ 18. watch folder
+# ---------------------------------------------------------------------
+def test_watcher_debounces_and_moves_inputs(sample_pdfs, tmp_path):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    watcher = FolderWatcher(
+        str(inbox), {"option": "rev"}, settle=2.0, output_dir=str(tmp_path / "output")
+    )
+    # Scanners often write upper-case extensions
+    good = inbox / "SCAN.PDF"
+    good.write_bytes(sample_pdfs[1].read_bytes())
+    (inbox / "bad.pdf").write_bytes(b"half a scan")
+
+    # Files are only picked up once they stop changing for 'settle' seconds
+    assert watcher.poll_once(now=100.0) == 0
+    with open(good, "ab") as f:
+        f.write(b"\n")
+    assert watcher.poll_once(now=101.0) == 0
+    assert watcher.poll_once(now=102.5) == 1
+    assert watcher.poll_once(now=103.5) == 1
+
+    assert (inbox / "processed" / "SCAN.PDF").exists()
+    assert (inbox / "failed" / "bad.pdf").exists()
+    assert len(PdfReader(tmp_path / "output" / "reverse" / "reverse-SCAN.PDF").pages) == 5
+
+    # The same name dropped again does not overwrite the first input
+    good.write_bytes(sample_pdfs[1].read_bytes())
+    assert watcher.poll_once(now=200.0) == 0
+    assert watcher.poll_once(now=203.0) == 1
+    assert (inbox / "processed" / "SCANcopy-1.PDF").exists()
+    stats = watcher.stats()
+    assert (stats["processed"], stats["failed"], stats["queued"]) == (2, 1, 0)
+
+
+@pytest.mark.skipif(pdf_watch.Observer is None, reason="needs watchdog")
+def test_watcher_run_wakes_on_file_events(sample_pdfs, tmp_path):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    # Polling alone would not look again for a minute
+    watcher = FolderWatcher(
+        str(inbox),
+        {"option": "rev"},
+        settle=0.2,
+        poll_interval=60.0,
+        output_dir=str(tmp_path / "output"),
+    )
+    stop = threading.Event()
+    thread = threading.Thread(target=watcher.run, args=(stop,), daemon=True)
+    thread.start()
+    try:
+        time.sleep(0.5)
+        (inbox / "scan.pdf").write_bytes(sample_pdfs[1].read_bytes())
+        deadline = time.time() + 10
+        while watcher.processed == 0 and time.time() < deadline:
+            time.sleep(0.05)
+        assert (inbox / "processed" / "scan.pdf").exists()
+    finally:
+        stop.set()
+        watcher.wake.set()
+        thread.join(timeout=10)
+    assert not thread.is_alive()
+
+
+# ---------------------------------------------------------------------
+# ✅ 19. start-up time
+# ---------------------------------------------------------------------
+def test_cli_help_startup_budget():
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "project.py", "--help"],
+        cwd=Path(pdf_edit.__file__).parent,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0
+    assert "--option" in result.stdout
+    imports = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and line.split("|")[1].strip().isdigit():
+            _, cumulative, module = line.split("|")
+            imports[module.strip()] = int(cumulative)
+    # The CLI never loads the GUI toolkit, and --help never loads pypdf
+    for heavy in ("customtkinter", "tkinter", "gui_", "pypdf", "concurrent.futures"):
+        assert heavy not in imports
+    # Import budget for pdf_edit in microseconds (importing pypdf alone costs more)
+    assert imports["pdf_edit"] < 150_000
+
+
+# ---------------------------------------------------------------------
+# ✅ 20. output optimization
+# ---------------------------------------------------------------------
+def test_optimize_levels(tmp_path):
+    # Uncompressed, repetitive page content, like many generated reports
+    writer = PdfWriter()
+    for number in range(30):
+        page = writer.add_blank_page(width=612, height=792)
+        content = DecodedStreamObject()
+        lines = [
+            f"BT /F1 10 Tf 72 {700 - i} Td (Page {number + 1} row {i}) Tj ET"
+            for i in range(100)
+        ]
+        content.set_data("\n".join(lines).encode())
+        page[NameObject("/Contents")] = writer._add_object(content)
+    source = tmp_path / "plain.pdf"
+    writer.write(source)
+    sizes = {}
+    for level in ("off", "fast", "max"):
+        editor = PDFEdit(output_dir=tmp_path / level)
+        editor.pdf_marge([str(source), str(source)], optimize=level)
+        saved = editor.marge_outputs[0]
+        sizes[level] = os.path.getsize(saved)
+        reader = PdfReader(saved)
+        assert len(reader.pages) == 60
+        assert b"(Page 30 row 99)" in reader.pages[29].get_contents().get_data()
+        if level != "off":
+            report = editor.optimize_reports[0]
+            assert report["size"] == sizes[level]
+            assert report["bytes_after"] < report["bytes_before"]
+    # max also writes the content shared by both copies only once
+    assert sizes["max"] < sizes["fast"] < sizes["off"]
+
+    with pytest.raises(ValueError):
+        PDFEdit(output_dir=tmp_path).pdf_reverse([str(source)], optimize="best")
+    with pytest.raises(ValueError):
+        PDFEdit(output_dir=tmp_path).pdf_split([str(source)], ranges="1", optimize="best")
+    report = PDFEdit(output_dir=tmp_path).run_job(
+        {"option": "split", "files": [str(source)], "ranges": "1", "optimize": "best"}
+    )
+    assert report["status"] == "failed"
+    assert "Unknown optimize level 'best'" in report["error"]
+
+
+# ---------------------------------------------------------------------
+# ✅ 21. parallel merge
+# ---------------------------------------------------------------------
+def test_parallel_marge_keeps_order_and_outline(tmp_path):
+    files = make_corpus(tmp_path / "corpus", files=5, pages=4, outline_depth=2)
+    # Different sizes, so the groups are balanced by page count
+    files.append(str(tmp_path / "big.pdf"))
+    make_pdf(files[-1], pages=20, outline_depth=2)
+
+    serial = PDFEdit(output_dir=tmp_path / "serial")
+    serial.pdf_marge(files)
+    parallel = PDFEdit(output_dir=tmp_path / "parallel")
+    parallel.pdf_marge(files, workers=3)
+
+    expected = PdfReader(serial.marge_outputs[0])
+    merged = PdfReader(parallel.marge_outputs[0])
+    assert len(merged.pages) == len(expected.pages) == 40
+    assert [page.extract_text() for page in merged.pages] == [
+        page.extract_text() for page in expected.pages
+    ]
+
+    def flat(reader, items):
+        out = []
+        for item in items:
+            if isinstance(item, list):
+                out.append(flat(reader, item))
+            else:
+                out.append((item.title, reader.get_destination_page_number(item)))
+        return out
+
+    assert flat(merged, merged.outline) == flat(expected, expected.outline)
+    assert parallel.metrics.counters["files"] == 6
+
+
+# ---------------------------------------------------------------------
+# ✅ 22. memory-mapped inputs
+# ---------------------------------------------------------------------
+def test_mmap_inputs_split(tmp_path):
+    source = tmp_path / "scans.pdf"
+    make_pdf(source, pages=12, scan_size=32)
+    editor = PDFEdit(output_dir=tmp_path / "output", mmap_inputs=True)
+    fds_before = len(os.listdir("/proc/self/fd")) if os.path.isdir("/proc/self/fd") else 0
+    [(ok, saved)] = editor.pdf_split([str(source)], ranges="3-4,10-")
+    assert ok
+    # The map is released once the parts are written, and never cached
+    if fds_before:
+        assert len(os.listdir("/proc/self/fd")) == fds_before
+    assert editor.readers.stats()["entries"] == 0
+    assert [len(PdfReader(path).pages) for path in saved] == [2, 3]
+    assert "Page 10 " in PdfReader(saved[1]).pages[0].extract_text()
+    assert editor.metrics.counters["bytes_mapped"] == os.path.getsize(source)
+    assert editor.metrics.counters["bytes_read"] == 0
+
+
+# ---------------------------------------------------------------------
+# ✅ 23. search index
+# ---------------------------------------------------------------------
+def test_pdf_index_search(tmp_path):
+    folder = tmp_path / "outputs"
+    folder.mkdir()
+    make_pdf(folder / "a.pdf", pages=5)
+    make_pdf(folder / "b.pdf", pages=8)
+    editor = PDFEdit(output_dir=tmp_path / "output")
+    report = editor.pdf_index([str(folder)], workers=2)
+    assert (report["indexed"], report["unchanged"], report["failed"]) == (2, 0, [])
+
+    hits = editor.search("Account 100006")
+    assert hits == [(str(folder / "b.pdf"), 7)]
+    assert len(editor.search("account")) == 13
+    assert editor.search("account 999999") == []
+
+
+def test_pdf_index_is_incremental(tmp_path):
+    folder = tmp_path / "outputs"
+    folder.mkdir()
+    make_pdf(folder / "a.pdf", pages=3)
+    make_pdf(folder / "b.pdf", pages=3)
+    editor = PDFEdit(output_dir=tmp_path / "output")
+    editor.pdf_index([str(folder)], workers=1)
+
+    os.remove(folder / "a.pdf")
+    make_pdf(folder / "b.pdf", pages=4)
+    (folder / "broken.pdf").write_bytes(b"%PDF-1.7\nnot really")
+    report = editor.pdf_index([str(folder)], workers=1)
+    assert (report["indexed"], report["unchanged"], report["removed"]) == (1, 0, 1)
+    assert [path for path, _ in report["failed"]] == [str(folder / "broken.pdf")]
+    assert editor.search("page 4") == [(str(folder / "b.pdf"), 4)]
+
+    report = editor.pdf_index([str(folder)], workers=1)
+    assert (report["indexed"], report["unchanged"], report["removed"]) == (0, 1, 0)
+
+
+# ---------------------------------------------------------------------
+# ✅ 24. incremental append
+# ---------------------------------------------------------------------
+def test_pdf_append_writes_only_new_revision(tmp_path):
+    make_pdf(tmp_path / "a.pdf", pages=40, outline_depth=1)
+    make_pdf(tmp_path / "b.pdf", pages=2, outline_depth=1)
+    make_pdf(tmp_path / "c.pdf", pages=3)
+    bundle = str(tmp_path / "bundle" / "daily.pdf")
+    editor = PDFEdit(output_dir=tmp_path / "output")
+    assert editor.pdf_append(bundle, [str(tmp_path / "a.pdf")]) == (True, bundle)
+    first = Path(bundle).read_bytes()
+
+    assert editor.pdf_append(bundle, [str(tmp_path / "b.pdf")]) == (True, bundle)
+    assert editor.pdf_append(bundle, [str(tmp_path / "c.pdf")]) == (True, bundle)
+    grown = Path(bundle).read_bytes()
+    # The earlier revision is kept byte for byte; only the new one is added
+    assert grown.startswith(first)
+    assert len(grown) - len(first) < len(first) / 4
+    assert grown.count(b"%%EOF") == 3
+
+    reader = PdfReader(bundle)
+    assert len(reader.pages) == 45
+    assert len(reader.outline) == 42
+    assert "Page 3 " in reader.pages[-1].extract_text()
+    assert editor.scan_pdfs([bundle])[0]["pages"] == 45
+
+
+def test_pdf_append_in_run_job(tmp_path):
+    make_pdf(tmp_path / "a.pdf", pages=2)
+    bundle = str(tmp_path / "daily.pdf")
+    editor = PDFEdit(output_dir=tmp_path / "output")
+    job = {"id": "j", "option": "append", "bundle": bundle, "files": [str(tmp_path / "a.pdf")]}
+    assert editor.run_job(job)["status"] == "ok"
+    assert editor.run_job(job)["outputs"] == [bundle]
+    assert len(PdfReader(bundle).pages) == 4
+    (tmp_path / "bad.pdf").write_bytes(b"%PDF-1.7\ntruncated")
+    report = editor.run_job({**job, "files": [str(tmp_path / "bad.pdf")]})
+    assert report["status"] == "failed"
+    assert len(PdfReader(bundle).pages) == 4
+
+
+# ---------------------------------------------------------------------
+# ✅ 25. page selections in merges
+# ---------------------------------------------------------------------
+def test_split_page_selection(tmp_path):
+    editor = PDFEdit(output_dir=tmp_path / "output")
+    assert editor.split_page_selection("A.pdf:1-2,5") == ("A.pdf", [(1, 2), (5, 5)])
+    assert editor.split_page_selection("A.pdf") == ("A.pdf", None)
+    assert editor.split_page_selection(r"C:\docs\A.pdf") == (r"C:\docs\A.pdf", None)
+    assert editor.split_page_selection(r"C:\docs\A.pdf:10-") == (r"C:\docs\A.pdf", [(10, None)])
+    named = tmp_path / "odd:3.pdf"
+    named.write_bytes(b"")
+    assert editor.split_page_selection(str(named)) == (str(named), None)
+    with pytest.raises(ValueError):
+        editor.split_page_selection("A.pdf:2-1")
+
+
+@pytest.mark.parametrize("options", [{}, {"stream": True}, {"workers": 2}])
+def test_pdf_marge_page_selections(tmp_path, options):
+    make_pdf(tmp_path / "A.pdf", pages=5, outline_depth=1)
+    make_pdf(tmp_path / "B.pdf", pages=2)
+    make_pdf(tmp_path / "C.pdf", pages=12)
+    editor = PDFEdit(output_dir=tmp_path / "output")
+    editor.pdf_marge(
+        [f"{tmp_path / 'A.pdf'}:1-2", str(tmp_path / "B.pdf"), f"{tmp_path / 'C.pdf'}:10-"],
+        **options,
+    )
+    reader = PdfReader(editor.marge_outputs[0])
+    texts = [page.extract_text().split(" account")[0] for page in reader.pages]
+    assert texts == ["Page 1", "Page 2", "Page 1", "Page 2", "Page 10", "Page 11", "Page 12"]
+    # Only the bookmarks of the selected pages of A are kept
+    assert len(reader.outline) == 2
+    assert not os.path.exists(tmp_path / "output" / "split")